@@ -4,6 +4,8 @@ import os
 import sys
 from pydub import AudioSegment
 import numpy as np
+from stegokernel import sisip_lsb, baca_lsb
+from stegobits import DeretBit
 
 # --- Encryption Functions (Unchanged) ---
 
@@ -66,6 +68,101 @@ def calculate_random_start_index(message_size_in_bits, m, audio_samples, seed):
     print(f"Calculated random start index: {Irand}")
     return Irand
 
+# --- Amplitude-Adaptive Depth ---
+#
+# In adaptive mode every sample carries its own number of bits, 0..max_depth. The depth
+# is computed only from the bits above max_depth, which embedding never touches, so the
+# extractor recomputes exactly the same depths from the stego samples. Loud samples carry
+# up to max_depth bits, more than the fixed m; quiet samples carry fewer bits or are
+# skipped entirely. The m chosen by the user is only the baseline the capacity gain is
+# reported against; max_depth and headroom are stored in the header.
+
+# A sample carries at most (bit length of |sample|) - headroom bits, so the embedding noise
+# stays roughly `headroom` bits (~6 dB per bit) below the local amplitude.
+ADAPTIVE_HEADROOM_BITS = 6
+ADAPTIVE_MAX_DEPTH = 8
+# max_depth stays below 16 so the sign bit of an int16 sample is never written
+ADAPTIVE_MAX_DEPTH_LIMIT = 15
+ADAPTIVE_FIELD_BITS = 4
+# Adaptive header: isRandom (1) + '00' (2) + size (32) + max depth - 1 (4) + headroom (4)
+ADAPTIVE_HEADER_SIZE = 35 + 2 * ADAPTIVE_FIELD_BITS
+
+# Payloads of 2^32 - 1 bits or more store this marker in the 32-bit size field and the real
+# size in a 64-bit field right after the rest of the header. Older files never contain the
+# marker, so they still parse the same way.
+LARGE_SIZE_MARKER = 0xFFFFFFFF
+LARGE_SIZE_BITS = 64
+
+def adaptive_depths(samples, max_depth, headroom=ADAPTIVE_HEADROOM_BITS):
+    """Per-sample embedding depth (0..max_depth), derived from the bits above max_depth."""
+    high = samples.astype(np.int32) >> max_depth
+    magnitude = np.where(high < 0, ~high, high)
+    # frexp exponent of a positive integer is its bit length (and 0 for 0)
+    bit_length = np.frexp(magnitude.astype(np.float64))[1] + max_depth
+    return np.clip(bit_length - headroom, 0, max_depth).astype(np.int64)
+
+def adaptive_capacity(samples, m, max_depth=ADAPTIVE_MAX_DEPTH, headroom=ADAPTIVE_HEADROOM_BITS,
+                      header_size=ADAPTIVE_HEADER_SIZE):
+    """
+    Payload capacity in bits after the header: (adaptive, fixed m). The ratio is the
+    capacity gain of adaptive mode over fixed-m LSB on the same cover.
+    """
+    adaptive = int(adaptive_depths(samples[header_size:], max_depth, headroom).sum())
+    fixed = max(0, len(samples) - 35) * m
+    return adaptive, fixed
+
+def _adaptive_layout(depths, n_bits):
+    """
+    Maps payload bit i to (sample index, bit position) for the given per-sample depths.
+    Bits fill each sample from bit 0 upward, like the fixed-m payload in this file.
+    Returns (sample_index, bit_position, samples_used).
+    """
+    end = np.cumsum(depths)
+    samples_used = int(np.searchsorted(end, n_bits)) + 1 if n_bits else 0
+    if samples_used > len(depths):
+        raise ValueError("Not enough adaptive capacity for the payload.")
+    used = depths[:samples_used]
+    sample_index = np.repeat(np.arange(samples_used), used)[:n_bits]
+    first_bit = np.repeat(end[:samples_used] - used, used)[:n_bits]
+    bit_position = np.arange(n_bits) - first_bit
+    return sample_index, bit_position, samples_used
+
+def embed_bits_adaptive(samples, bits, depths):
+    """Writes `bits` into the low bits of `samples` (in place) using per-sample `depths`."""
+    sample_index, bit_position, samples_used = _adaptive_layout(depths, len(bits))
+    weights = np.left_shift(1, bit_position)
+    mask = np.bincount(sample_index, weights=weights, minlength=samples_used).astype(np.int64)
+    value = np.bincount(sample_index, weights=weights * bits, minlength=samples_used).astype(np.int64)
+    target = samples[:samples_used]
+    target[:] = (target.astype(np.int64) & ~mask) | value
+    return samples_used
+
+def extract_bits_adaptive(samples, n_bits, depths):
+    """Reads `n_bits` payload bits from `samples` using per-sample `depths`."""
+    sample_index, bit_position, _ = _adaptive_layout(depths, n_bits)
+    return ((samples[sample_index].astype(np.int64) >> bit_position) & 1).astype(np.uint8)
+
+def calculate_adaptive_start_index(message_size_in_bits, depths, seed, header_size):
+    """
+    Random start for adaptive mode: chosen uniformly among all starts (after the header and
+    buffer) from which the remaining adaptive capacity still holds the payload.
+    """
+    print("\n--- Calculating Random Start Index ---")
+    buffer = 200 # Same safe buffer as the fixed-m random start
+    lowest = header_size + buffer
+    # Capacity from each index to the end of the audio
+    capacity_from = np.cumsum(depths[::-1])[::-1]
+    highest = int(np.searchsorted(-capacity_from, -message_size_in_bits, side='right')) - 1
+
+    if highest < lowest:
+        print("\n[ERROR] The secret file is likely too large for this MP3 in adaptive mode.")
+        return None
+
+    random.seed(seed)
+    Irand = random.randint(lowest, highest)
+    print(f"Calculated random start index: {Irand}")
+    return Irand
+
 def key_to_seed(key):
     """Converts a string key into a numerical seed."""
     seed = 0
@@ -75,13 +172,13 @@ def key_to_seed(key):
 
 def convert_file_to_bits(file_path):
     """
-    Reads any file in binary mode and converts its content to a list of bits.
+    Reads any file in binary mode and converts its content to a packed bit stream.
     """
     print(f"--- [Step 2] Converting '{os.path.basename(file_path)}' to a bit stream ---")
     try:
         with open(file_path, 'rb') as f:
             content_bytes = f.read()
-        bits = [int(bit) for byte in content_bytes for bit in format(byte, '08b')]
+        bits = DeretBit(content_bytes)
         print(f"File converted to {len(bits)} bits.")
         return bits
     except FileNotFoundError:
@@ -91,10 +188,18 @@ def convert_file_to_bits(file_path):
         print(f"[ERROR] Could not read file: {e}")
         return None
 
-def embed_file(mp3_path, secret_file_path, output_path, m, isEncrypt, isRandom, key):
+def embed_file(mp3_path, secret_file_path, output_path, m, isEncrypt, isRandom, key, isAdaptive=False,
+               max_depth=ADAPTIVE_MAX_DEPTH, headroom=ADAPTIVE_HEADROOM_BITS):
     """
     Embeds any secret file into an MP3 file. Returns True on success, False on failure.
+    With isAdaptive, each sample's depth follows its amplitude (up to max_depth bits, keeping
+    `headroom` bits below it) and m is only the baseline for the reported capacity gain.
     """
+    if isAdaptive and not (1 <= max_depth <= ADAPTIVE_MAX_DEPTH_LIMIT and 0 <= headroom < 1 << ADAPTIVE_FIELD_BITS):
+        print(f"[ERROR] Adaptive maximum depth must be 1-{ADAPTIVE_MAX_DEPTH_LIMIT} and headroom "
+              f"0-{(1 << ADAPTIVE_FIELD_BITS) - 1}.")
+        return False
+
     try:
         audio = AudioSegment.from_mp3(mp3_path)
         samples = np.array(audio.get_array_of_samples())
@@ -123,78 +228,86 @@ def embed_file(mp3_path, secret_file_path, output_path, m, isEncrypt, isRandom,
 
     # --- Step 2: Create the main payload (type, flag, secret) ---
     print(f"--- [Step 2] Converting secret data and creating payload ---")
-    secret_bits = [int(bit) for byte in secret_content for bit in format(byte, '08b')]
-    
     filename_without_extension, extension = os.path.splitext(os.path.basename(secret_file_path))
     secret_type = extension[1:] if extension else "bin"
 
-    type_bits = [int(b) for char in secret_type for b in format(ord(char), '08b')]
-    encrypt_flag_bits = [1] if isEncrypt else [0] 
-
-    main_payload_bits = type_bits + encrypt_flag_bits + secret_bits
+    # Each type character is at least 8 bits wide, as with format(ord(char), '08b')
+    main_payload_bits = DeretBit()
+    for char in secret_type:
+        main_payload_bits.tambah(ord(char), max(8, ord(char).bit_length()))
+    main_payload_bits.tambah(isEncrypt, 1).tambah_bytes(secret_content)
     main_payload_size_bits = len(main_payload_bits)
     print(f"Created main payload. Total bits to hide in main block: {main_payload_size_bits}")
     
     # --- Step 3: Embed the unencrypted header (isRandom, m, size) ---
     print("--- [Step 3] Embedding unencrypted header ---")
     
-    if len(samples) < 41:
+    header_size = ADAPTIVE_HEADER_SIZE if isAdaptive else 35
+    if len(samples) < max(41, header_size):
         print("[ERROR] Audio file is too short to hold the header.")
         return False
         
-    def embed_header_bits(bit_list, start_offset):
-        for i, bit in enumerate(bit_list):
-            sample_index = start_offset + i
-            sample_val = samples[sample_index].item()
-            sample_binary = list(format(sample_val & 0xFFFF, '016b'))
-            sample_binary[-1] = str(bit)
-            new_val_str = "".join(sample_binary)
-            new_val = int(new_val_str, 2)
-            if new_val > 32767: new_val -= 65536
-            samples[sample_index] = new_val
-
-    embed_header_bits(['1' if isRandom else '0'], 0)
+    # Header layout: isRandom(1) + m(2) + size(32) [+ max depth - 1 (4) + headroom (4)] [+ 64-bit size]
+    header_bits = DeretBit().tambah(isRandom, 1)
     print(f"isRandom flag set to {'1' if isRandom else '0'}")
     
-    m_bits = [int(b) for b in format(m, '02b')]
-    embed_header_bits(m_bits, 1)
-    print(f"m value ({m}) embedded.")
+    # Adaptive mode is marked by m = 0 ('00'); the maximum depth and headroom follow the size field
+    header_bits.tambah(0 if isAdaptive else m, 2)
+    print(f"m value ({'adaptive' if isAdaptive else m}) embedded.")
     
-    size_bits = [int(b) for b in format(main_payload_size_bits, '032b')]
-    embed_header_bits(size_bits, 3)
-    print(f"Main payload size ({main_payload_size_bits}) embedded.")
+    isLargeSize = main_payload_size_bits >= LARGE_SIZE_MARKER
+    header_bits.tambah(LARGE_SIZE_MARKER if isLargeSize else main_payload_size_bits, 32)
+
+    if isAdaptive:
+        header_bits.tambah(max_depth - 1, ADAPTIVE_FIELD_BITS).tambah(headroom, ADAPTIVE_FIELD_BITS)
+        print(f"Maximum adaptive depth ({max_depth}) and headroom ({headroom}) embedded.")
+        depths = adaptive_depths(samples, max_depth, headroom)
+        adaptive_bits, fixed_bits = adaptive_capacity(samples, m, max_depth, headroom)
+        gain = adaptive_bits / fixed_bits if fixed_bits else float('inf')
+        print(f"Adaptive capacity: {adaptive_bits} bits ({adaptive_bits / len(samples):.2f} bits/sample), "
+              f"fixed m={m}: {fixed_bits} bits, gain x{gain:.2f}; "
+              f"{np.count_nonzero(depths == 0) / len(samples):.1%} of samples carry no bits.")
+
+    if isLargeSize:
+        if main_payload_size_bits >= 1 << LARGE_SIZE_BITS or len(samples) < header_size + LARGE_SIZE_BITS:
+            print("[ERROR] The secret file is too large for this MP3 or for the 64-bit size field.")
+            return False
+        header_bits.tambah(main_payload_size_bits, LARGE_SIZE_BITS)
+        header_size += LARGE_SIZE_BITS
+    sisip_lsb(samples[:len(header_bits)], header_bits.ke_bit(), 1)
+    print(f"Main payload size ({main_payload_size_bits}{', 64-bit field' if isLargeSize else ''}) embedded.")
 
     # --- Step 4: Determine the starting index for the main payload ---
-    start_index = 35
+    start_index = header_size
     if isRandom:
         seed = key_to_seed(key)
-        start_index = calculate_random_start_index(main_payload_size_bits, m, samples, seed)
+        if isAdaptive:
+            start_index = calculate_adaptive_start_index(main_payload_size_bits, depths, seed, header_size)
+        else:
+            start_index = calculate_random_start_index(main_payload_size_bits, m, samples, seed)
         if start_index is None:
             return False
 
     # --- Step 5: Check if the payload will fit ---
-    required_samples = math.ceil(main_payload_size_bits / m)
-    if start_index + required_samples >= len(samples):
-        print("[ERROR] Embedding failed: The secret file is too large to fit in the cover from the chosen start index.")
-        return False
-    
-    print(f"Size check passed. Payload requires {required_samples} audio samples.")
-    print(f"--- [Step 6] Embedding main payload starting at index {start_index} ---")
-    bit_index = 0
-    for i in range(required_samples):
-        sample_index = start_index + i
-        sample_val = samples[sample_index].item()
-        sample_binary = list(format(sample_val & 0xFFFF, '016b'))
-        
-        for j in range(m):
-            if bit_index < main_payload_size_bits:
-                sample_binary[-(j + 1)] = str(main_payload_bits[bit_index])
-                bit_index += 1
-        
-        new_val_str = "".join(sample_binary)
-        new_val = int(new_val_str, 2)
-        if new_val > 32767: new_val -= 65536
-        samples[sample_index] = new_val
+    payload_bits = main_payload_bits.ke_bit()
+    if isAdaptive:
+        try:
+            print(f"--- [Step 6] Embedding main payload adaptively starting at index {start_index} ---")
+            required_samples = embed_bits_adaptive(samples[start_index:], payload_bits, depths[start_index:])
+        except ValueError:
+            print("[ERROR] Embedding failed: The secret file is too large to fit in the cover from the chosen start index.")
+            return False
+        touched = np.count_nonzero(depths[start_index:start_index + required_samples])
+        print(f"Payload spans {required_samples} audio samples, {touched} of them carry bits.")
+    else:
+        required_samples = math.ceil(main_payload_size_bits / m)
+        if start_index + required_samples >= len(samples):
+            print("[ERROR] Embedding failed: The secret file is too large to fit in the cover from the chosen start index.")
+            return False
+
+        print(f"Size check passed. Payload requires {required_samples} audio samples.")
+        print(f"--- [Step 6] Embedding main payload starting at index {start_index} ---")
+        sisip_lsb(samples[start_index:start_index + required_samples], payload_bits, m, msb_dulu=False)
 
     # --- Step 7: Save the new stego MP3 file ---
     print("--- [Step 7] Saving new stego MP3 file ---")
@@ -228,78 +341,96 @@ def extract_file(stego_mp3_path, key, output_dir):
         return False
         
     def extract_header_bits(start_offset, count):
-        bits = []
-        for i in range(count):
-            sample_val = samples[start_offset + i].item()
-            bits.append(format(sample_val & 0xFFFF, '016b')[-1])
-        return "".join(bits)
+        return DeretBit.dari_bit(baca_lsb(samples[start_offset:start_offset + count], 1)).ambil(0, count)
 
-    isRandom_flag = (extract_header_bits(0, 1) == '1')
+    isRandom_flag = extract_header_bits(0, 1) == 1
     print(f"isRandom flag found: {isRandom_flag}")
     
-    m = int(extract_header_bits(1, 2), 2)
-    if not (1 <= m <= 16):
-        print(f"[ERROR] Extracted an invalid 'm' value: {m}. File may be corrupt.")
-        return False
-    print(f"Found embedded 'm' value: {m}")
+    m = extract_header_bits(1, 2)
+    isAdaptive = m == 0
     
-    main_payload_size_bits = int(extract_header_bits(3, 32), 2)
+    main_payload_size_bits = extract_header_bits(3, 32)
+
+    header_size = 35
+    if isAdaptive:
+        header_size = ADAPTIVE_HEADER_SIZE
+        if len(samples) < header_size:
+            print("[ERROR] Stego file is too short to contain a valid header.")
+            return False
+        max_depth = extract_header_bits(35, ADAPTIVE_FIELD_BITS) + 1
+        headroom = extract_header_bits(35 + ADAPTIVE_FIELD_BITS, ADAPTIVE_FIELD_BITS)
+        if max_depth > ADAPTIVE_MAX_DEPTH_LIMIT:
+            print("[ERROR] Header is corrupt: invalid adaptive maximum depth.")
+            return False
+        print(f"Adaptive depth mode, maximum depth: {max_depth}, headroom: {headroom}")
+        depths = adaptive_depths(samples, max_depth, headroom)
+    else:
+        print(f"Found embedded 'm' value: {m}")
+
+    if main_payload_size_bits == LARGE_SIZE_MARKER:
+        if len(samples) < header_size + LARGE_SIZE_BITS:
+            print("[ERROR] Stego file is too short to contain a valid header.")
+            return False
+        main_payload_size_bits = extract_header_bits(header_size, LARGE_SIZE_BITS)
+        header_size += LARGE_SIZE_BITS
     print(f"Found main payload size: {main_payload_size_bits} bits")
     
     # --- Step 2: Determine the start index ---
-    start_index = 35
+    start_index = header_size
     if isRandom_flag:
         if not key:
             print("[ERROR] This file was hidden with a random start index. A key is required.")
             return False
         print("Calculating random start index using the provided key...")
         seed = key_to_seed(key)
-        start_index = calculate_random_start_index(main_payload_size_bits, m, samples, seed)
+        if isAdaptive:
+            start_index = calculate_adaptive_start_index(main_payload_size_bits, depths, seed, header_size)
+        else:
+            start_index = calculate_random_start_index(main_payload_size_bits, m, samples, seed)
         if start_index is None:
             print("[ERROR] Could not calculate a valid start index. The key may be wrong.")
             return False
     else:
-        print("Using default start index of 41.")
+        print(f"Using default start index of {start_index}.")
         
     # --- Step 3: Extract the main payload ---
     print(f"--- [Step 3] Extracting {main_payload_size_bits} bits of the main payload ---")
-    total_samples_needed = math.ceil(main_payload_size_bits / m)
-    
-    if start_index + total_samples_needed > len(samples):
-        print("[ERROR] File appears to be truncated or header is corrupt.")
-        return False
+    if isAdaptive:
+        try:
+            payload_bits = extract_bits_adaptive(samples[start_index:], main_payload_size_bits, depths[start_index:])
+        except ValueError:
+            print("[ERROR] File appears to be truncated or header is corrupt.")
+            return False
+        main_payload_bits = DeretBit.dari_bit(payload_bits)
+    else:
+        total_samples_needed = math.ceil(main_payload_size_bits / m)
 
-    main_payload_bits = []
-    for i in range(total_samples_needed):
-        sample_binary = format(samples[start_index + i].item() & 0xFFFF, '016b')
-        for j in range(m):
-            main_payload_bits.append(sample_binary[-(j+1)])
+        if start_index + total_samples_needed > len(samples):
+            print("[ERROR] File appears to be truncated or header is corrupt.")
+            return False
+
+        payload_samples = samples[start_index:start_index + total_samples_needed]
+        main_payload_bits = DeretBit.dari_bit(baca_lsb(payload_samples, m, msb_dulu=False))
     
     main_payload_bits = main_payload_bits[:main_payload_size_bits]
     
     # --- Step 4: Parse the main payload ---
     print("--- [Step 4] Parsing main payload metadata ---")
-    main_payload_str = "".join(main_payload_bits)
-    
-    type_bits_str = main_payload_str[:8]
-    secret_type = "".join([chr(int(type_bits_str[i:i+8], 2)) for i in range(0, len(type_bits_str), 8)])
+    secret_type = chr(main_payload_bits.ambil(0, 8))
     print(f"Found file type: .{secret_type}")
 
     encrypt_flag_start_index = 8
-    encrypt_flag = (main_payload_str[encrypt_flag_start_index] == '1')
+    encrypt_flag = main_payload_bits[encrypt_flag_start_index] == 1
     print(f"Encryption flag found: {encrypt_flag}")
 
     secret_data_start_index = encrypt_flag_start_index + 1
-    secret_data_bits_str = main_payload_str[secret_data_start_index:]
+    secret_data_bits = main_payload_bits[secret_data_start_index:]
     
     # --- Step 5: Reconstruct the file ---
     print(f"--- [Step 5] Reconstructing file bytes ---")
-    file_bytes = bytearray()
-    for i in range(0, len(secret_data_bits_str), 8):
-        byte_str = secret_data_bits_str[i:i+8]
-        if len(byte_str) == 8:
-            file_bytes.append(int(byte_str, 2))
-    reconstructed_content = bytes(file_bytes)
+    # A trailing partial byte is dropped
+    whole_bits = len(secret_data_bits) // 8 * 8
+    reconstructed_content = bytes(secret_data_bits[:whole_bits])
     
     # --- Step 6: Decrypt if necessary ---
     if encrypt_flag:
@@ -346,6 +477,14 @@ def handle_embedding():
         secret_in = input("Enter the path to the secret file to hide: ")
         mp3_out = input("Enter the output path for the new stego MP3: ")
         m_val = int(input("Enter number of bits to use per sample (1-4): "))
+        AdaptiveChoice = input("Sesuaikan jumlah bit per sampel dengan amplitudo? (Ya/Tidak): ").lower()
+        isAdaptive = True if AdaptiveChoice == 'ya' else False
+        max_depth, headroom = ADAPTIVE_MAX_DEPTH, ADAPTIVE_HEADROOM_BITS
+        if isAdaptive:
+            max_depth = int(input(f"Kedalaman maksimum sampel keras (1-{ADAPTIVE_MAX_DEPTH_LIMIT}, "
+                                  f"default {ADAPTIVE_MAX_DEPTH}): ") or ADAPTIVE_MAX_DEPTH)
+            headroom = int(input(f"Jarak bit di bawah amplitudo sampel (0-15, default {ADAPTIVE_HEADROOM_BITS}): ")
+                           or ADAPTIVE_HEADROOM_BITS)
         EncryptChoice = input("Apakah Anda ingin melakukan enkripsi sebelum penyisipan? (Ya/Tidak): ").lower()
         isEncrypt = True if EncryptChoice == 'ya' else False
         RandomChoice = input("Apakah Anda ingin menggunakan titik awal penyisipan acak? (Ya/Tidak): ").lower()
@@ -360,7 +499,7 @@ def handle_embedding():
             return
 
         print("\nStarting the embedding process...")
-        embed_file(mp3_in, secret_in, mp3_out, m_val, isEncrypt, isRandom, key)
+        embed_file(mp3_in, secret_in, mp3_out, m_val, isEncrypt, isRandom, key, isAdaptive, max_depth, headroom)
 
     except ValueError:
         print("\n[ERROR] Invalid input for insertion bits. Please enter an integer.")
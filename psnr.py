@@ -1,10 +1,13 @@
-import numpy as np
-import librosa
+from stegoaudio import hitung_metrik_audio
 
 def hitung_psnr_mp3(path_audio_asli, path_audio_stego):
     """
     Menghitung PSNR untuk file audio (termasuk MP3)
-    berdasarkan formula dari gambar.
+    berdasarkan formula dari gambar (kekuatan sinyal P0 dan P1).
+
+    Perhitungan dilakukan oleh mesin metrik di stegoaudio.py, yang sekaligus
+    menghasilkan PSNR berbasis MSE, SNR, SNR segmental, dan galat maksimum
+    dalam satu kali dekode.
 
     Args:
         path_audio_asli (str): Path ke file audio asli (cover).
@@ -14,38 +17,7 @@ def hitung_psnr_mp3(path_audio_asli, path_audio_stego):
         float: Nilai PSNR dalam dB.
     """
     try:
-        # 1. Membaca data audio menggunakan librosa
-        # librosa.load mengembalikan data audio (sebagai float) dan sample rate
-        # sr=None memastikan sample rate asli tetap dipertahankan
-        audio_asli, sr_asli = librosa.load(path_audio_asli, sr=None)
-        audio_stego, sr_stego = librosa.load(path_audio_stego, sr=None)
-
-        # 2. Validasi
-        # if sr_asli != sr_stego or len(audio_asli) != len(audio_stego):
-        #     raise ValueError("File audio asli dan stego harus memiliki sample rate dan panjang yang sama.")
-
-        # 3. Menghitung kekuatan sinyal (P0 dan P1)
-        # Karena librosa sudah mengembalikan float, kita tidak perlu konversi tipe lagi
-        
-        # P0: Kekuatan sinyal audio asli
-        P0 = np.mean(audio_asli**2)
-        
-        # P1: Kekuatan sinyal audio stego
-        P1 = np.mean(audio_stego**2)
-
-        if P0 == P1:
-            return float('inf')
-
-        # 4. Menerapkan formula PSNR
-        numerator = P1**2
-        denominator = (P1 - P0)**2
-        
-        if denominator == 0:
-            return float('inf')
-
-        psnr_value = 10 * np.log10(numerator / denominator)
-        
-        return psnr_value
+        return hitung_metrik_audio(path_audio_asli, path_audio_stego)['psnr_daya']
 
     except FileNotFoundError:
         print(f"Error: Salah satu file tidak ditemukan.")
@@ -0,0 +1,167 @@
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# =============================================================
+# == STEGANALISIS LSB (CHI-SQUARE DAN PASANGAN NILAI) ==
+# =============================================================
+#
+# Untuk memeriksa seberapa mudah output kita sendiri terdeteksi. Penyisipan acak pada bidang
+# bit k menyamakan jumlah kemunculan setiap pasangan nilai (PoV) yang hanya berbeda di bit k.
+# Per jendela dan per bidang bit dihitung:
+#
+#   p          : p-value uji chi-square Westfeld-Pfitzmann atas pasangan nilai. Mendekati 1
+#                berarti histogram "terlalu rata", tanda bidang itu terisi bit acak.
+#   ketimpangan: sum |genap - ganjil| / sum (genap + ganjil) atas pasangan yang sama dengan
+#                uji chi-square; turun ke dekat 0 pada bidang yang terisi penuh.
+#
+# Domain 'byte' memakai byte mentah file (domain final.py), domain 'sampel' memakai sampel
+# int16 hasil baca soundfile, kanal berselang-seling seperti get_array_of_samples pydub
+# (domain coba.py). Histogram dihitung per blok `langkah` nilai dengan np.bincount, lalu
+# jendela sepanjang `jendela` nilai dijumlahkan secara bergeser dari blok-blok itu.
+
+# Panjang jendela default (dalam nilai) per domain, langkah default setengahnya; histogram sampel punya 65536 bin
+JENDELA_DEFAULT = {'byte': 1 << 16, 'sampel': 1 << 20}
+BIDANG_DEFAULT = 4
+# Kategori chi-square dengan frekuensi harapan di bawah ini diabaikan (aturan umum uji chi-square)
+BATAS_HARAPAN = 5
+# Jendela dengan p di atas ambang ini dianggap mencurigakan
+AMBANG_P = 0.95
+EKSTENSI_SAMPEL = ('.wav', '.flac', '.aif', '.aiff', '.ogg')
+
+def _blok_byte(path, ukuran_blok):
+    ukuran = os.path.getsize(path)
+    if ukuran == 0:
+        return
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    for i in range(0, ukuran, ukuran_blok):
+        yield data[i:i + ukuran_blok]
+
+def _blok_sampel(path, ukuran_blok):
+    import soundfile as sf
+
+    with sf.SoundFile(path) as f_audio:
+        frame_per_blok = max(1, ukuran_blok // f_audio.channels)
+        while True:
+            blok = f_audio.read(frame_per_blok, dtype='int16', always_2d=True)
+            if not len(blok):
+                break
+            # Bit dua's complement sama dengan uint16, sehingga bin histogram = pola bit sampel
+            yield blok.ravel().view(np.uint16)
+
+def _p_chi_square(x, df):
+    """P(X >= x) untuk X ~ chi-square(df), aproksimasi Wilson-Hilferty (akurat untuk df puluhan ke atas)."""
+    if df <= 0:
+        return float('nan')
+    h = 2.0 / (9.0 * df)
+    z = ((x / df) ** (1.0 / 3.0) - (1.0 - h)) / math.sqrt(h)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+def statistik_pasangan(histogram, bidang=BIDANG_DEFAULT):
+    """(p, ketimpangan) untuk bidang bit 0..bidang-1 dari satu histogram nilai (panjang pangkat dua)."""
+    p = np.empty(bidang)
+    ketimpangan = np.empty(bidang)
+    for k in range(bidang):
+        # Baris: nilai dengan bit-bit lain sama; kolom tengah: bit k bernilai 0 atau 1
+        pasangan = histogram.reshape(-1, 2, 1 << k)
+        genap, ganjil = pasangan[:, 0, :].ravel(), pasangan[:, 1, :].ravel()
+        # Pasangan yang jarang muncul hanya menambah derau, pada kedua statistik
+        dipakai = genap + ganjil >= 2 * BATAS_HARAPAN
+        genap, ganjil = genap[dipakai], ganjil[dipakai]
+        total = (genap + ganjil).sum()
+        ketimpangan[k] = np.abs(genap - ganjil).sum() / total if total else float('nan')
+
+        harapan = (genap + ganjil) / 2
+        chi2 = float((((genap - harapan) ** 2) / harapan).sum())
+        p[k] = _p_chi_square(chi2, len(genap) - 1)
+    return p, ketimpangan
+
+def analisis_file(path, domain='auto', jendela=None, langkah=None, bidang=BIDANG_DEFAULT):
+    """
+    Statistik LSB per jendela bergeser untuk satu file.
+
+    Returns:
+        dict: path, domain, jumlah (nilai), jendela, langkah, offset (awal tiap jendela, dalam nilai),
+              p dan ketimpangan (array jendela x bidang).
+    """
+    if domain == 'auto':
+        domain = 'sampel' if os.path.splitext(path)[1].lower() in EKSTENSI_SAMPEL else 'byte'
+    jendela = jendela or JENDELA_DEFAULT[domain]
+    langkah = langkah or jendela // 2
+    if jendela % langkah:
+        raise ValueError("Panjang jendela harus kelipatan langkah.")
+    n_bin = 256 if domain == 'byte' else 1 << 16
+    if not 1 <= bidang <= (8 if domain == 'byte' else 16):
+        raise ValueError("Jumlah bidang bit di luar jangkauan domain.")
+    blok_per_jendela = jendela // langkah
+    sumber = _blok_byte(path, langkah) if domain == 'byte' else _blok_sampel(path, langkah)
+
+    antrian = deque()
+    berjalan = np.zeros(n_bin, dtype=np.int64)
+    offset, daftar_p, daftar_ketimpangan = [], [], []
+    jumlah = 0
+    for blok in sumber:
+        histogram = np.bincount(blok, minlength=n_bin)
+        antrian.append(histogram)
+        berjalan += histogram
+        jumlah += len(blok)
+        if len(antrian) > blok_per_jendela:
+            berjalan -= antrian.popleft()
+        if len(antrian) == blok_per_jendela:
+            p, ketimpangan = statistik_pasangan(berjalan, bidang)
+            offset.append(jumlah - int(berjalan.sum()))
+            daftar_p.append(p)
+            daftar_ketimpangan.append(ketimpangan)
+
+    # File lebih pendek dari satu jendela: seluruh isinya menjadi satu jendela
+    if not offset and jumlah:
+        p, ketimpangan = statistik_pasangan(berjalan, bidang)
+        offset, daftar_p, daftar_ketimpangan = [0], [p], [ketimpangan]
+
+    return {
+        'path': path,
+        'domain': domain,
+        'jumlah': jumlah,
+        'jendela': jendela,
+        'langkah': langkah,
+        'offset': np.array(offset, dtype=np.int64),
+        'p': np.array(daftar_p).reshape(-1, bidang),
+        'ketimpangan': np.array(daftar_ketimpangan).reshape(-1, bidang),
+    }
+
+def ringkas(hasil):
+    """Ringkasan per bidang bit: p rata-rata dan maksimum, jendela curiga, dan ketimpangan rata-rata."""
+    ringkasan = []
+    for k in range(hasil['p'].shape[1]):
+        p = hasil['p'][:, k]
+        curiga = np.flatnonzero(p > AMBANG_P)
+        ringkasan.append({
+            'bidang': k,
+            'p_rata': float(np.nanmean(p)) if len(p) else float('nan'),
+            'p_maks': float(np.nanmax(p)) if len(p) else float('nan'),
+            'jendela': len(p),
+            'jendela_curiga': len(curiga),
+            # Rentang nilai yang dicakup jendela curiga: dari awal sampai ke akhir penyisipan berurutan
+            'awal_curiga': int(hasil['offset'][curiga[0]]) if len(curiga) else None,
+            'akhir_curiga': int(min(hasil['jumlah'], hasil['offset'][curiga[-1]] + hasil['jendela']))
+                            if len(curiga) else None,
+            'ketimpangan_rata': float(np.nanmean(hasil['ketimpangan'][:, k])) if len(p) else float('nan'),
+        })
+    return ringkasan
+
+def _analisis_aman(path, domain, jendela, langkah, bidang):
+    """Dijalankan di proses pekerja: galat per file dikembalikan, bukan dilempar, agar file lain tetap jalan."""
+    try:
+        return analisis_file(path, domain, jendela, langkah, bidang)
+    except Exception as e:
+        return {'path': path, 'galat': str(e)}
+
+def analisis_banyak(daftar_path, domain='auto', jendela=None, langkah=None, bidang=BIDANG_DEFAULT,
+                    jumlah_proses=None):
+    """analisis_file untuk banyak file secara paralel (satu file per proses pekerja), urutan dipertahankan."""
+    n = len(daftar_path)
+    with ProcessPoolExecutor(max_workers=jumlah_proses) as eksekutor:
+        return list(eksekutor.map(_analisis_aman, daftar_path, [domain] * n, [jendela] * n, [langkah] * n,
+                                  [bidang] * n))
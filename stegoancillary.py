@@ -0,0 +1,245 @@
+import io
+import numpy as np
+from stegostream import (UKURAN_CHUNK, FLAG_FRAME, FLAG_ANCILLARY, FLAG_KEYSTREAM, FLAG_CRC,
+                         CELAH_GABUNG_PATCH, baca_header_spesial, _rencana_sisip, _SumberBit, _bit_payload, _patch_chunk)
+from stegoframe import UKURAN_PRATINJAU, ukuran_id3v2, pindai_frame, muat_indeks
+
+# =============================================================
+# == MODE ANCILLARY (TANPA DEKODE, AUDIO TIDAK BERUBAH) ==
+# =============================================================
+#
+# Mode aman-frame masih mengubah LSB main data, sehingga koefisien Huffman ikut berubah.
+# Mode ini hanya memakai bit yang diabaikan dekoder Layer III:
+#
+#   - data ancillary: byte main data yang tidak dipakai data audio frame mana pun. Data audio
+#     frame k dimulai main_data_begin byte sebelum main data frame k (bit reservoir) sepanjang
+#     jumlah part2_3_length granule/kanalnya; sisanya adalah celah yang bebas ditulisi.
+#   - bit private: 1 bit di header frame dan 1-5 bit private_bits di side information.
+#     Frame ber-CRC dilewati karena CRC-nya mencakup header dan side information.
+#
+# Semua field dibaca langsung dari header dan side information secara vektor, tanpa dekode
+# audio. Bit-bit pembawa diurutkan menurut posisinya di file; TampilanBit memperlihatkannya
+# sebagai "cover" dengan satu byte per bit pembawa (di LSB), sehingga header spesial dan
+# payload memakai format yang sama dengan m = 1. Penyisipan hanya membaca dan menulis byte
+# di frame yang dilewati header dan payload; hasil dekode audio identik dengan cover.
+
+# main_data_begin terbesar (9 bit, MPEG-1): sejauh ini frame berikutnya bisa memakai byte di belakangnya
+BATAS_RESERVOIR = 511
+
+def _ambil_bit(data, posisi_bit, lebar):
+    """Field `lebar` bit (paling banyak 17) mulai dari posisi bit absolut `posisi_bit`, secara vektor."""
+    b = np.minimum(posisi_bit // 8, len(data) - 3)
+    tiga = (data[b].astype(np.int64) << 16) | (data[b + 1].astype(np.int64) << 8) | data[b + 2]
+    return (tiga >> (24 - posisi_bit % 8 - lebar)) & ((1 << lebar) - 1)
+
+def peta_pembawa(data, indeks, tuntas=True):
+    """
+    Posisi bit absolut (bit ke-i dari byte ke-i // 8, MSB dulu) semua bit pembawa di MP3 `data`
+    (array uint8) dengan indeks frame `indeks`, terurut. Dengan `tuntas` False, `data` hanya awalan
+    file: bit yang masih bisa dipakai frame di luar awalan (bit reservoir) tidak diikutkan, sehingga
+    hasilnya selalu awalan dari peta file lengkap.
+    """
+    # Frame Layer I/II dan frame info VBR dilindungi seluruhnya dan tidak ikut bit reservoir
+    layer3 = indeks['terlindungi'] < indeks['panjang']
+    if not tuntas:
+        layer3 &= indeks['posisi'] + indeks['panjang'] <= len(data)
+    posisi, panjang, terlindungi = (indeks[nama][layer3] for nama in ('posisi', 'panjang', 'terlindungi'))
+    if len(posisi) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    b1, b3 = data[posisi + 1], data[posisi + 3]
+    mpeg1 = ((b1 >> 3) & 3) == 3
+    n_kanal = np.where((b3 >> 6) == 3, 1, 2)
+    tanpa_crc = (b1 & 1) == 1
+
+    # Tata letak side information: main_data_begin, private_bits, (scfsi), lalu blok per granule dan kanal
+    awal_side = (posisi + np.where(tanpa_crc, 4, 6)) * 8
+    lebar_mdb = np.where(mpeg1, 9, 8)
+    lebar_private = np.where(mpeg1, np.where(n_kanal == 1, 5, 3), n_kanal)
+    main_data_begin = _ambil_bit(data, awal_side, lebar_mdb)
+    awal_granule = awal_side + lebar_mdb + lebar_private + np.where(mpeg1, 4 * n_kanal, 0)
+    langkah = np.where(mpeg1, 59, 63)
+    bit_audio = np.zeros(len(posisi), dtype=np.int64)
+    for granule in range(2):
+        for kanal in range(2):
+            ada = (kanal < n_kanal) & (mpeg1 | (granule == 0))
+            part2_3_length = _ambil_bit(data, awal_granule + (granule * n_kanal + kanal) * langkah, 12)
+            bit_audio += np.where(ada, part2_3_length, 0)
+
+    # Celah ancillary pada deret main data semua frame yang disambung (offset virtual)
+    offset = np.concatenate(([0], np.cumsum(panjang - terlindungi)))
+    total = int(offset[-1])
+    mulai = np.clip(offset[:-1] - main_data_begin, 0, total)
+    selesai = np.clip(offset[:-1] - main_data_begin + (bit_audio + 7) // 8, mulai, total)
+    urutan = np.argsort(mulai, kind='stable')
+    mulai, selesai = mulai[urutan], np.maximum.accumulate(selesai[urutan])
+    celah_awal = np.concatenate(([0], selesai))
+    celah_akhir = np.concatenate((mulai, [total]))
+    batas = total if tuntas else max(0, total - BATAS_RESERVOIR)
+    celah_akhir = np.minimum(celah_akhir, batas)
+    dipakai = celah_akhir > celah_awal
+    celah_awal, celah_akhir = celah_awal[dipakai], celah_akhir[dipakai]
+
+    # Celah dipotong di batas frame, lalu dipetakan ke byte fisik
+    titik = np.union1d(np.concatenate((celah_awal, celah_akhir)), offset)
+    a, b = titik[:-1], titik[1:]
+    i = np.searchsorted(celah_awal, a, side='right') - 1
+    di_celah = (i >= 0) & (b <= np.append(celah_akhir, 0)[i])
+    a, b = a[di_celah], b[di_celah]
+    frame = np.searchsorted(offset, a, side='right') - 1
+    awal_fisik = posisi[frame] + terlindungi[frame] + (a - offset[frame])
+    n_byte = b - a
+    byte_ancillary = np.repeat(awal_fisik - np.concatenate(([0], np.cumsum(n_byte)[:-1])), n_byte) \
+        + np.arange(int(n_byte.sum()))
+    bit_ancillary = (byte_ancillary[:, None] * 8 + np.arange(8)).ravel()
+
+    # Bit private header (bit terakhir byte ketiga) dan private_bits side information
+    bit_private = [(posisi[tanpa_crc] + 2) * 8 + 7]
+    for j in range(5):
+        ada = tanpa_crc & (j < lebar_private)
+        bit_private.append(awal_side[ada] + lebar_mdb[ada] + j)
+
+    peta = np.sort(np.concatenate([bit_ancillary] + bit_private))
+    if not tuntas:
+        # Semua bit pembawa sebelum offset virtual `batas` sudah pasti; sesudahnya dibuang
+        frame = min(int(np.searchsorted(offset, batas, side='right')) - 1, len(posisi) - 1)
+        batas_fisik = posisi[frame] + terlindungi[frame] + (batas - offset[frame])
+        peta = peta[:np.searchsorted(peta, batas_fisik * 8)]
+    return peta
+
+def muat_peta(path, simpan=True):
+    """
+    Peta bit pembawa file MP3 `path`, memakai indeks frame dari sidecar jika ada
+    (sidecar baru hanya ditulis jika `simpan`).
+    """
+    indeks = muat_indeks(path, simpan)
+    return peta_pembawa(np.memmap(path, dtype=np.uint8, mode='r'), indeks)
+
+# =============================================================
+# == TAMPILAN FILE ATAS BIT PEMBAWA ==
+# =============================================================
+
+def _rentang_berurutan(byte, celah=1):
+    """Membagi array byte terurut menjadi rentang [awal, akhir) yang jarak antar byte-nya kurang dari `celah`."""
+    if len(byte) == 0:
+        return []
+    putus = np.flatnonzero(np.diff(byte) > celah) + 1
+    return [(int(r[0]), int(r[-1]) + 1) for r in np.split(byte, putus)]
+
+class TampilanBit:
+    """
+    File-like (read/write/seek/tell) dengan satu byte virtual per bit pembawa: membaca menghasilkan
+    byte 0/1, menulis hanya mengambil LSB tiap byte. Hanya byte fisik yang bit pembawanya benar-benar
+    berubah yang ditulis ulang.
+    """
+
+    def __init__(self, f, peta):
+        self.f = f
+        self.peta = peta
+        self.ukuran = len(peta)
+        self.posisi = 0
+
+    def seek(self, posisi, dari=0):
+        self.posisi = posisi if dari == 0 else (self.posisi + posisi if dari == 1 else self.ukuran + posisi)
+        return self.posisi
+
+    def tell(self):
+        return self.posisi
+
+    def _baca_byte(self, byte):
+        """Nilai byte-byte fisik (array terurut tanpa duplikat); byte berdekatan dibaca sekaligus."""
+        nilai = np.empty(len(byte), dtype=np.uint8)
+        for awal, akhir in _rentang_berurutan(byte, CELAH_GABUNG_PATCH):
+            self.f.seek(awal)
+            bentang = np.frombuffer(self.f.read(akhir - awal), dtype=np.uint8)
+            a, b = np.searchsorted(byte, [awal, akhir])
+            nilai[a:b] = bentang[byte[a:b] - awal]
+        return nilai
+
+    def _bagian(self, n):
+        """Bit pembawa untuk n byte virtual berikutnya: (byte unik, awal kelompok, geser bit)."""
+        bit = self.peta[self.posisi:self.posisi + n]
+        byte = bit >> 3
+        awal_kelompok = np.flatnonzero(np.concatenate(([True], byte[1:] != byte[:-1])))
+        return bit, byte[awal_kelompok], awal_kelompok, (7 - (bit & 7)).astype(np.uint8)
+
+    def read(self, n=-1):
+        bit, byte, awal_kelompok, geser = self._bagian(self.ukuran if n is None or n < 0 else n)
+        if len(bit) == 0:
+            return b''
+        nilai = np.repeat(self._baca_byte(byte), np.diff(np.append(awal_kelompok, len(bit))))
+        self.posisi += len(bit)
+        return ((nilai >> geser) & 1).tobytes()
+
+    def write(self, data):
+        bit, byte, awal_kelompok, geser = self._bagian(len(data))
+        if len(bit) < len(data):
+            raise ValueError("Penulisan melewati akhir region ancillary MP3.")
+        if len(bit) == 0:
+            return 0
+        isi = (np.frombuffer(bytes(data), dtype=np.uint8) & 1) << geser
+        masker = np.bitwise_or.reduceat(np.uint8(1) << geser, awal_kelompok)
+        lama = self._baca_byte(byte)
+        baru = (lama & ~masker) | np.bitwise_or.reduceat(isi, awal_kelompok)
+
+        berubah = np.flatnonzero(baru != lama)
+        for awal, akhir in _rentang_berurutan(byte[berubah]):
+            a, b = np.searchsorted(byte, [awal, akhir])
+            self.f.seek(awal)
+            self.f.write(baru[a:b].tobytes())
+        self.posisi += len(bit)
+        return len(bit)
+
+    def flush(self):
+        self.f.flush()
+
+# =============================================================
+# == PENYISIPAN DAN DETEKSI ==
+# =============================================================
+
+def sisipkan_ancillary(f_stego, peta, f_pesan, panjang_pesan, isEncrypt, isRandom, key, tipe, flags=0,
+                       ukuran_chunk=UKURAN_CHUNK, progres=None):
+    """
+    Menyisipkan pesan ke bit pembawa `peta` pada f_stego (salinan cover, dibuka 'r+b'). Hanya
+    header spesial dan rentang payload yang dibaca dan ditulis. `progres` (total diisi di sini)
+    dihitung dalam bit pembawa. Mengembalikan indeks bit pembawa awal payload.
+    """
+    flags |= FLAG_FRAME | FLAG_ANCILLARY
+    if not isEncrypt:
+        flags &= ~FLAG_KEYSTREAM
+    tampilan = TampilanBit(f_stego, peta)
+    rencana = _rencana_sisip(tampilan.ukuran, panjang_pesan, isRandom, 1, key, flags)
+    sumber = _SumberBit(_bit_payload(f_pesan, panjang_pesan, isEncrypt, key, tipe, ukuran_chunk, rencana['nonce'],
+                                     bool(flags & FLAG_CRC)))
+
+    daerah = [(0, len(rencana['bit_spesial'])), (rencana['start_byte_index'], rencana['end_byte_index'])]
+    if daerah[1][0] <= daerah[0][1]:
+        daerah = [(0, daerah[1][1])]
+    if progres is not None:
+        progres.total = sum(akhir - awal for awal, akhir in daerah)
+
+    for awal, akhir in daerah:
+        for posisi in range(awal, akhir, ukuran_chunk):
+            tampilan.seek(posisi)
+            chunk = np.frombuffer(tampilan.read(min(ukuran_chunk, akhir - posisi)), dtype=np.uint8).copy()
+            _patch_chunk(chunk, posisi, rencana, sumber)
+            tampilan.seek(posisi)
+            tampilan.write(chunk)
+            if progres is not None:
+                progres.maju(len(chunk))
+    return rencana['start_byte_index']
+
+def adalah_stego_ancillary(f_stego):
+    """True jika header spesial ditemukan di bit pembawa awal MP3 dengan flag FLAG_ANCILLARY."""
+    f_stego.seek(0)
+    awal = f_stego.read(10)
+    f_stego.seek(0)
+    data = np.frombuffer(f_stego.read(ukuran_id3v2(awal) + UKURAN_PRATINJAU), dtype=np.uint8)
+    indeks = pindai_frame(data)
+    if len(indeks['posisi']) == 0:
+        return False
+    try:
+        flags = baca_header_spesial(TampilanBit(io.BytesIO(data.tobytes()), peta_pembawa(data, indeks, False)))[3]
+    except ValueError:
+        return False
+    return bool(flags & FLAG_ANCILLARY)
@@ -0,0 +1,180 @@
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+from stegostream import UKURAN_CHUNK, BATAS_SPOOL_MEMORI, FLAG_CRC, baca_crc, baca_pesan
+
+# =============================================================
+# == FORMAT ARSIP ==
+# =============================================================
+#
+# Payload arsip = daftar isi (TOC) + data anggota berurutan.
+#
+#   TOC    : ukuran_toc (u32) + jumlah_anggota (u16) + entri...
+#   entri  : panjang_nama (u8) + nama (utf-8) + offset (u64) + panjang (u64) + flags (u8)
+#
+# Offset dihitung dari awal region data (tepat setelah TOC), sehingga satu anggota
+# dapat diekstrak dengan langsung seek ke posisi bitnya tanpa membaca anggota lain.
+
+TIPE_ARSIP = "arsip"
+FORMAT_KEPALA_TOC = '<IH'
+FORMAT_ENTRI_TOC = '<QQB'
+
+# Flag per anggota
+ANGGOTA_ZLIB = 0x01 # data anggota dikompresi dengan zlib
+
+def periksa_nama_anggota(nama):
+    """
+    Nama anggota harus berupa nama file polos: tidak kosong, bukan '.'/'..', tanpa pemisah folder
+    ('/' maupun '\\', agar arsip portabel) dan tanpa NUL. Nama dari TOC menjadi path output.
+    """
+    if nama in ('', '.', '..') or any(c in nama for c in '/\\\0'):
+        raise ValueError(f"Nama anggota arsip tidak valid: {nama!r}")
+    return nama
+
+def _salin_terkompresi(f_input, f_output):
+    """Mengompresi f_input ke f_output per chunk. Mengembalikan jumlah byte hasil kompresi."""
+    kompresor = zlib.compressobj()
+    jumlah = 0
+    while True:
+        chunk = f_input.read(UKURAN_CHUNK)
+        if not chunk:
+            break
+        hasil = kompresor.compress(chunk)
+        f_output.write(hasil)
+        jumlah += len(hasil)
+    hasil = kompresor.flush()
+    f_output.write(hasil)
+    return jumlah + len(hasil)
+
+def bangun_arsip(daftar_file, kompres=False):
+    """
+    Menyusun payload arsip dari daftar file ke file sementara (spooled).
+    Mengembalikan (file, panjang) dengan posisi file di awal.
+    """
+    nama_anggota = [periksa_nama_anggota(os.path.basename(path)) for path in daftar_file]
+    if len(set(nama_anggota)) != len(nama_anggota):
+        raise ValueError("Nama file anggota arsip tidak boleh kembar.")
+    if len(nama_anggota) > 0xFFFF:
+        raise ValueError("Jumlah anggota arsip terlalu banyak.")
+
+    # Data anggota disusun dulu karena panjang (terkompresi) dibutuhkan untuk TOC
+    f_data = tempfile.SpooledTemporaryFile(max_size=BATAS_SPOOL_MEMORI)
+    entri = []
+    offset = 0
+    for path, nama in zip(daftar_file, nama_anggota):
+        nama_bytes = nama.encode('utf-8')
+        if len(nama_bytes) > 0xFF:
+            raise ValueError(f"Nama file '{nama}' terlalu panjang.")
+
+        with open(path, "rb") as f_anggota:
+            if kompres:
+                panjang = _salin_terkompresi(f_anggota, f_data)
+                flags = ANGGOTA_ZLIB
+            else:
+                shutil.copyfileobj(f_anggota, f_data, UKURAN_CHUNK)
+                panjang = os.path.getsize(path)
+                flags = 0
+        entri.append(struct.pack('<B', len(nama_bytes)) + nama_bytes
+                     + struct.pack(FORMAT_ENTRI_TOC, offset, panjang, flags))
+        offset += panjang
+
+    badan_toc = b''.join(entri)
+    ukuran_toc = struct.calcsize(FORMAT_KEPALA_TOC) + len(badan_toc)
+
+    f_arsip = tempfile.SpooledTemporaryFile(max_size=BATAS_SPOOL_MEMORI)
+    f_arsip.write(struct.pack(FORMAT_KEPALA_TOC, ukuran_toc, len(entri)) + badan_toc)
+    f_data.seek(0)
+    shutil.copyfileobj(f_data, f_arsip, UKURAN_CHUNK)
+    f_data.close()
+
+    panjang = f_arsip.tell()
+    f_arsip.seek(0)
+    return f_arsip, panjang
+
+def baca_toc(f_stego, info, key):
+    """Membaca daftar isi arsip dari file stego. Mengembalikan (ukuran_toc, daftar anggota)."""
+    ukuran_kepala = struct.calcsize(FORMAT_KEPALA_TOC)
+    kepala = b''.join(baca_pesan(f_stego, info, key, 0, ukuran_kepala))
+    ukuran_toc, jumlah_anggota = struct.unpack(FORMAT_KEPALA_TOC, kepala)
+    if not ukuran_kepala <= ukuran_toc <= info['panjang_pesan_biner'] // 8:
+        raise ValueError("Daftar isi arsip rusak.")
+
+    badan = b''.join(baca_pesan(f_stego, info, key, ukuran_kepala, ukuran_toc - ukuran_kepala))
+    ukuran_entri = struct.calcsize(FORMAT_ENTRI_TOC)
+    daftar_anggota = []
+    posisi = 0
+    for _ in range(jumlah_anggota):
+        panjang_nama = badan[posisi]
+        nama = periksa_nama_anggota(badan[posisi + 1:posisi + 1 + panjang_nama].decode('utf-8'))
+        posisi += 1 + panjang_nama
+        offset, panjang, flags = struct.unpack(FORMAT_ENTRI_TOC, badan[posisi:posisi + ukuran_entri])
+        posisi += ukuran_entri
+        daftar_anggota.append({'nama': nama, 'offset': offset, 'panjang': panjang, 'flags': flags})
+
+    return ukuran_toc, daftar_anggota
+
+def ekstrak_anggota(f_stego, info, key, ukuran_toc, anggota, f_output, crc=0):
+    """
+    Mengekstrak satu anggota arsip ke f_output dengan seek langsung ke posisinya. Dengan f_output
+    None, data hanya dibaca. Mengembalikan CRC32 data tersimpan (sebelum dekompresi), lanjutan `crc`.
+    """
+    dekompresor = zlib.decompressobj() if anggota['flags'] & ANGGOTA_ZLIB and f_output else None
+    for chunk in baca_pesan(f_stego, info, key, ukuran_toc + anggota['offset'], anggota['panjang']):
+        crc = zlib.crc32(chunk, crc)
+        if dekompresor:
+            chunk = dekompresor.decompress(chunk)
+        if f_output:
+            f_output.write(chunk)
+    if dekompresor:
+        f_output.write(dekompresor.flush())
+    return crc
+
+def ekstrak_arsip(f_stego, info, key, folder, nama_dipilih=None):
+    """
+    Mengekstrak anggota arsip (semua, atau hanya `nama_dipilih`) ke dalam folder.
+    Mengembalikan daftar path file yang ditulis.
+    """
+    ukuran_toc, daftar_anggota = baca_toc(f_stego, info, key)
+    if nama_dipilih is not None:
+        tidak_ada = set(nama_dipilih) - {anggota['nama'] for anggota in daftar_anggota}
+        if tidak_ada:
+            raise ValueError(f"Anggota arsip tidak ditemukan: {', '.join(sorted(tidak_ada))}")
+
+    # Trailer CRC32 mencakup seluruh payload (TOC lalu data anggota berurutan), sehingga anggota
+    # yang tidak dipilih tetap dibaca untuk checksum
+    dengan_crc = bool(info['flags'] & FLAG_CRC)
+    if dengan_crc:
+        dibaca = sorted(daftar_anggota, key=lambda anggota: anggota['offset'])
+        crc = zlib.crc32(b''.join(baca_pesan(f_stego, info, key, 0, ukuran_toc)))
+    else:
+        dibaca = [anggota for anggota in daftar_anggota if nama_dipilih is None or anggota['nama'] in nama_dipilih]
+        crc = 0
+
+    os.makedirs(folder, exist_ok=True)
+    hasil = []
+    akhir = 0
+    try:
+        for anggota in dibaca:
+            if dengan_crc and anggota['offset'] != akhir:
+                raise ValueError("Daftar isi arsip rusak.")
+            akhir = anggota['offset'] + anggota['panjang']
+            if nama_dipilih is not None and anggota['nama'] not in nama_dipilih:
+                crc = ekstrak_anggota(f_stego, info, key, ukuran_toc, anggota, None, crc)
+                continue
+            # Nama sudah diperiksa periksa_nama_anggota saat TOC dibaca: nama file polos, tanpa folder
+            path_output = os.path.join(folder, anggota['nama'])
+            hasil.append(path_output)
+            with open(path_output, "wb") as f_output:
+                crc = ekstrak_anggota(f_stego, info, key, ukuran_toc, anggota, f_output, crc)
+
+        if dengan_crc and (ukuran_toc + akhir != info['panjang_pesan_biner'] // 8 or crc != baca_crc(f_stego, info)):
+            raise ValueError("Checksum pesan tidak cocok. Kunci mungkin salah atau file stego rusak.")
+    except Exception:
+        # Anggota yang isinya tidak terjamin tidak ditinggalkan
+        for path in hasil:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    return hasil
@@ -0,0 +1,391 @@
+import os
+import tempfile
+import threading
+import numpy as np
+from stegoprogres import Progres, Dibatalkan
+
+# =============================================================
+# == FUNGSI AUDIO (PSNR DAN PEMUTARAN) ==
+# =============================================================
+#
+# librosa dan playsound butuh beberapa detik untuk di-import, sedangkan penyisipan
+# dan ekstraksi tidak memerlukannya. Keduanya sengaja di-import di dalam fungsi
+# agar hanya dimuat ketika metrik dihitung atau audio diputar.
+
+# Pratinjau A/B: jumlah detik audio di sekitar bagian yang diubah, dan panjang maksimum potongan
+DURASI_KONTEKS = 1.0
+DURASI_MAKS_SEGMEN = 8.0
+
+# Metrik kualitas: ukuran blok dekode (sampel), panjang frame SNR segmental, dan batas SNR per frame (dB)
+UKURAN_BLOK_METRIK = 1 << 16
+PANJANG_FRAME_SEGSNR = 1024
+BATAS_SEGSNR = (-10.0, 35.0)
+
+# Penyelarasan: panjang cuplikan awal (sampel), faktor downsample korelasi kasar, geser maksimum
+# yang dicari (sampel, cukup untuk delay encoder/decoder MP3 beberapa frame), dan korelasi
+# ternormalisasi minimum agar geser dipakai
+PANJANG_CUPLIKAN = 1 << 17
+FAKTOR_DOWNSAMPLE = 8
+GESER_MAKS = 1 << 15
+KORELASI_MIN = 0.5
+
+def play_mp3(path_audio):
+    """Memutar file audio menggunakan library playsound."""
+    try:
+        from playsound import playsound
+
+        print(f"🎵 Memutar file: {path_audio}...")
+        playsound(path_audio)
+        print("✅ Selesai memutar audio.")
+    except Exception as e:
+        # Menangani error spesifik dari playsound, misal format tidak didukung
+        print(f"❌ Gagal memutar audio: {e}")
+
+def _blok_audio(path_audio, ukuran_blok):
+    """
+    Mendekode file audio per blok (float [-1, 1], mono) tanpa memuat seluruh sinyal.
+    Format yang tidak bisa dibaca soundfile didekode sekali penuh oleh librosa lalu dipotong.
+    """
+    import soundfile as sf
+
+    try:
+        f_audio = sf.SoundFile(path_audio)
+    except (RuntimeError, sf.LibsndfileError):
+        import librosa
+        audio, _ = librosa.load(path_audio, sr=None)
+        for i in range(0, len(audio), ukuran_blok):
+            yield audio[i:i + ukuran_blok].astype(np.float64)
+        return
+
+    with f_audio:
+        while True:
+            blok = f_audio.read(ukuran_blok, dtype='float64', always_2d=True)
+            if not len(blok):
+                break
+            # Kanal dirata-rata, sama seperti librosa.load(mono=True)
+            yield blok.mean(axis=1)
+
+def _jumlah_sampel(path_audio):
+    """Jumlah sampel per kanal menurut header file, atau None jika tidak bisa dibaca tanpa dekode penuh."""
+    import soundfile as sf
+
+    try:
+        return sf.info(path_audio).frames
+    except (RuntimeError, sf.LibsndfileError):
+        return None
+
+def _info_audio(path_audio):
+    """(sample rate, jumlah kanal) menurut header file, atau None jika tidak bisa dibaca soundfile."""
+    import soundfile as sf
+
+    try:
+        info = sf.info(path_audio)
+    except (RuntimeError, sf.LibsndfileError):
+        return None
+    return info.samplerate, info.channels
+
+def periksa_format_sama(path_audio_asli, path_audio_stego):
+    """
+    Memastikan sample rate dan jumlah kanal cover dan stego sama; selisih sampel antara dua sinyal
+    dengan rate atau kanal berbeda tidak bermakna. File yang formatnya tidak terbaca tanpa dekode
+    penuh tidak diperiksa. Mengembalikan sample rate (atau None).
+    """
+    info_asli, info_stego = _info_audio(path_audio_asli), _info_audio(path_audio_stego)
+    if info_asli is None or info_stego is None:
+        return None
+    (sr_asli, kanal_asli), (sr_stego, kanal_stego) = info_asli, info_stego
+    if sr_asli != sr_stego:
+        raise ValueError(f"Sample rate cover ({sr_asli} Hz) dan stego ({sr_stego} Hz) berbeda.")
+    if kanal_asli != kanal_stego:
+        raise ValueError(f"Jumlah kanal cover ({kanal_asli}) dan stego ({kanal_stego}) berbeda.")
+    return sr_asli
+
+def _cuplikan(path_audio, panjang):
+    """`panjang` sampel pertama (mono, float32 agar ringan) tanpa mendekode sisa file."""
+    potongan, n = [], 0
+    for blok in _blok_audio(path_audio, min(panjang, UKURAN_BLOK_METRIK)):
+        potongan.append(blok[:panjang - n].astype(np.float32))
+        n += len(potongan[-1])
+        if n >= panjang:
+            break
+    return np.concatenate(potongan) if potongan else np.empty(0, dtype=np.float32)
+
+def _korelasi_fft(a, b, geser_maks):
+    """
+    Korelasi silang c[k] = sum a[i] * b[i + k] untuk |k| <= geser_maks lewat FFT, O(n log n).
+    Mengembalikan (daftar k, c[k]).
+    """
+    n_fft = 1 << int(len(a) + len(b) - 1).bit_length()
+    c = np.fft.irfft(np.conj(np.fft.rfft(a, n_fft)) * np.fft.rfft(b, n_fft), n_fft)
+    geser_maks = min(geser_maks, len(a) - 1, len(b) - 1)
+    k = np.arange(-geser_maks, geser_maks + 1)
+    return k, c[k % n_fft]
+
+def _korelasi_langsung(a, b, daftar_k):
+    """c[k] = sum a[i] * b[i + k] untuk sedikit k, sepanjang bagian yang bertumpuk."""
+    hasil = []
+    for k in daftar_k:
+        x, y = (a[:len(b) - k], b[k:]) if k >= 0 else (a[-k:], b[:len(a) + k])
+        n = min(len(x), len(y))
+        hasil.append(float(np.dot(x[:n], y[:n])) if n else 0.0)
+    return np.array(hasil)
+
+def estimasi_geser(path_audio_asli, path_audio_stego, panjang=PANJANG_CUPLIKAN, faktor=FAKTOR_DOWNSAMPLE,
+                   geser_maks=GESER_MAKS):
+    """
+    Memperkirakan geser (sampel) antara cover dan stego, misalnya delay decoder atau frame yang
+    bergeser: stego[i + geser] ~ cover[i]. Korelasi kasar dihitung dengan FFT pada cuplikan awal
+    yang di-downsample `faktor` kali (rata-rata per blok), lalu dihaluskan pada rate penuh di
+    sekitar puncaknya.
+
+    Returns:
+        (geser, korelasi): korelasi ternormalisasi di puncak; 0.0 jika cuplikan senyap.
+    """
+    asli, stego = _cuplikan(path_audio_asli, panjang), _cuplikan(path_audio_stego, panjang)
+    if not len(asli) or not len(stego):
+        return 0, 0.0
+    asli -= asli.mean()
+    stego -= stego.mean()
+    energi = float(np.sqrt(float(np.dot(asli, asli)) * float(np.dot(stego, stego))))
+    if energi == 0:
+        return 0, 0.0
+
+    n_asli, n_stego = len(asli) // faktor, len(stego) // faktor
+    if n_asli > 1 and n_stego > 1:
+        kasar_asli = asli[:n_asli * faktor].reshape(-1, faktor).mean(axis=1)
+        kasar_stego = stego[:n_stego * faktor].reshape(-1, faktor).mean(axis=1)
+        k, c = _korelasi_fft(kasar_asli, kasar_stego, geser_maks // faktor)
+        kasar = int(k[np.argmax(c)]) * faktor
+    else:
+        kasar = 0
+
+    daftar_k = np.arange(kasar - faktor, kasar + faktor + 1)
+    c = _korelasi_langsung(asli, stego, daftar_k)
+    terbaik = int(np.argmax(c))
+    return int(daftar_k[terbaik]), c[terbaik] / energi
+
+def _lewati(blok_blok, n):
+    """Membuang n sampel pertama dari generator blok."""
+    for blok in blok_blok:
+        if n >= len(blok):
+            n -= len(blok)
+            continue
+        yield blok[n:]
+        n = 0
+
+def _catat_energi(blok_blok, energi, i):
+    """Meneruskan blok sambil menambahkan energi dan jumlah sampelnya ke energi[i] dan energi[i + 1]."""
+    for blok in blok_blok:
+        energi[i] += float(np.dot(blok, blok))
+        energi[i + 1] += len(blok)
+        yield blok
+
+def _blok_berpasangan(path_audio_asli, path_audio_stego, ukuran_blok, geser=0, energi=None):
+    """
+    Memasangkan blok cover dan stego dengan panjang sama; berhenti di akhir sinyal yang lebih pendek.
+    Dengan `geser` > 0, stego[i + geser] dipasangkan dengan cover[i] (sebaliknya untuk geser < 0).
+    Jika `energi` ([energi cover, sampel cover, energi stego, sampel stego]) diberikan, energi seluruh
+    sinyal, termasuk bagian yang dilewati geser dan ekor yang tidak berpasangan, dijumlahkan ke situ.
+    """
+    sisa_asli = sisa_stego = np.empty(0)
+    blok_asli, blok_stego = _blok_audio(path_audio_asli, ukuran_blok), _blok_audio(path_audio_stego, ukuran_blok)
+    if energi is not None:
+        blok_asli, blok_stego = _catat_energi(blok_asli, energi, 0), _catat_energi(blok_stego, energi, 2)
+    blok_asli, blok_stego = _lewati(blok_asli, max(0, -geser)), _lewati(blok_stego, max(0, geser))
+    while True:
+        if not len(sisa_asli):
+            sisa_asli = next(blok_asli, None)
+        if not len(sisa_stego):
+            sisa_stego = next(blok_stego, None)
+        if sisa_asli is None or sisa_stego is None:
+            if energi is not None:
+                # Ekor sinyal yang lebih panjang tetap didekode agar energinya ikut terhitung
+                for _ in blok_asli:
+                    pass
+                for _ in blok_stego:
+                    pass
+            return
+        n = min(len(sisa_asli), len(sisa_stego))
+        yield sisa_asli[:n], sisa_stego[:n]
+        sisa_asli, sisa_stego = sisa_asli[n:], sisa_stego[n:]
+
+def _ke_db(pembilang, penyebut):
+    if penyebut == 0:
+        return float('inf')
+    if pembilang == 0:
+        return float('-inf')
+    return float(10 * np.log10(pembilang / penyebut))
+
+def _psnr_daya(daya_asli, daya_stego):
+    """PSNR dari daya rata-rata P0 (cover) dan P1 (stego): 10 log10(P1^2 / (P1 - P0)^2)."""
+    if daya_asli == daya_stego:
+        return float('inf')
+    return _ke_db(daya_stego ** 2, (daya_stego - daya_asli) ** 2)
+
+def _akumulasi_segsnr(asli, galat, panjang_frame, batas_bawah, batas_atas, total, jumlah_frame):
+    """Menambahkan SNR tiap frame (frame senyap dilewati) ke akumulator SNR segmental."""
+    energi_asli = (asli.reshape(-1, panjang_frame) ** 2).sum(axis=1)
+    energi_galat = (galat.reshape(-1, panjang_frame) ** 2).sum(axis=1)
+    aktif = energi_asli > 0
+    with np.errstate(divide='ignore'):
+        snr = 10 * np.log10(energi_asli[aktif] / energi_galat[aktif])
+    snr = np.clip(snr, batas_bawah, batas_atas)
+    return total + float(snr.sum()), jumlah_frame + int(aktif.sum())
+
+def hitung_metrik_audio(path_audio_asli, path_audio_stego, ukuran_blok=UKURAN_BLOK_METRIK,
+                        panjang_frame=PANJANG_FRAME_SEGSNR, progres=None, token=None, selaraskan=True):
+    """
+    Menghitung semua metrik kualitas dalam satu kali dekode per blok, memakai akumulator berjalan.
+    `progres(selesai, total, laju, eta)` dipanggil per blok dalam satuan sampel, dan `token`
+    (stegoprogres.TokenBatal) diperiksa di antara blok. Sample rate dan jumlah kanal harus sama;
+    dengan `selaraskan`, geser antara kedua sinyal diperkirakan (estimasi_geser) dan diterapkan
+    lebih dulu, asalkan korelasinya di atas KORELASI_MIN.
+
+    Returns:
+        dict: jumlah_sampel, mse, psnr (MSE, MAX = 1.0), psnr_daya (rumus P0/P1 di psnr.py, dengan
+              daya tiap sinyal utuh seperti semula), psnr_daya_selaras (rumus yang sama pada bagian
+              yang dipasangkan setelah penyelarasan), snr, snr_segmental (frame `panjang_frame` sampel, dibatasi BATAS_SEGSNR dB),
+              galat_maks (selisih absolut terbesar), sample_rate (None jika tidak diketahui),
+              geser (sampel yang diterapkan), dan korelasi (None tanpa penyelarasan).
+    """
+    sample_rate = periksa_format_sama(path_audio_asli, path_audio_stego)
+    geser, korelasi = 0, None
+    if selaraskan:
+        geser, korelasi = estimasi_geser(path_audio_asli, path_audio_stego)
+        if korelasi < KORELASI_MIN:
+            geser = 0
+
+    # Blok harus kelipatan panjang frame agar frame SNR segmental tidak terpotong di batas blok
+    ukuran_blok = max(1, ukuran_blok // panjang_frame) * panjang_frame
+    batas_bawah, batas_atas = BATAS_SEGSNR
+
+    jumlah = 0
+    energi_asli = energi_stego = energi_galat = 0.0
+    energi_utuh = [0.0, 0, 0.0, 0]
+    galat_maks = 0.0
+    total_segsnr, jumlah_frame = 0.0, 0
+    sisa_asli, sisa_galat = np.empty(0), np.empty(0)
+
+    pelacak = None
+    if progres is not None or token is not None:
+        total = [_jumlah_sampel(path_audio_asli), _jumlah_sampel(path_audio_stego)]
+        # Sampel yang dilewati karena geser tidak ikut dihitung
+        total = None if None in total else max(0, min(total[0] + min(0, geser), total[1] - max(0, geser)))
+        pelacak = Progres(total, progres, token)
+
+    for asli, stego in _blok_berpasangan(path_audio_asli, path_audio_stego, ukuran_blok, geser, energi_utuh):
+        galat = asli - stego
+        jumlah += len(asli)
+        energi_asli += float(np.dot(asli, asli))
+        energi_stego += float(np.dot(stego, stego))
+        energi_galat += float(np.dot(galat, galat))
+        if len(galat):
+            galat_maks = max(galat_maks, float(np.abs(galat).max()))
+
+        # SNR segmental per frame; sisa yang belum genap satu frame dibawa ke blok berikutnya
+        asli, galat = np.concatenate([sisa_asli, asli]), np.concatenate([sisa_galat, galat])
+        n_frame = len(asli) // panjang_frame
+        potong = n_frame * panjang_frame
+        sisa_asli, sisa_galat = asli[potong:], galat[potong:]
+        if n_frame:
+            total_segsnr, jumlah_frame = _akumulasi_segsnr(asli[:potong], galat[:potong], panjang_frame,
+                                                           batas_bawah, batas_atas, total_segsnr, jumlah_frame)
+        if pelacak is not None:
+            pelacak.ke(jumlah)
+
+    if len(sisa_asli):
+        total_segsnr, jumlah_frame = _akumulasi_segsnr(sisa_asli, sisa_galat, len(sisa_asli),
+                                                       batas_bawah, batas_atas, total_segsnr, jumlah_frame)
+
+    if jumlah == 0:
+        raise ValueError("File audio tidak berisi sampel.")
+
+    mse = energi_galat / jumlah
+    return {
+        'jumlah_sampel': jumlah,
+        'mse': mse,
+        'psnr': _ke_db(1.0, mse),
+        'psnr_daya': _psnr_daya(energi_utuh[0] / energi_utuh[1], energi_utuh[2] / energi_utuh[3]),
+        'psnr_daya_selaras': _psnr_daya(energi_asli / jumlah, energi_stego / jumlah),
+        'snr': _ke_db(energi_asli, energi_galat),
+        'snr_segmental': total_segsnr / jumlah_frame if jumlah_frame else float('inf'),
+        'galat_maks': galat_maks,
+        'sample_rate': sample_rate,
+        'geser': geser,
+        'korelasi': korelasi,
+    }
+
+def hitung_psnr_mp3(path_audio_asli, path_audio_stego, progres=None, token=None):
+    """
+    PSNR berbasis MSE (MAX = 1.0). Mengembalikan None jika gagal. `progres` dan `token` seperti
+    pada hitung_metrik_audio; pembatalan diteruskan sebagai stegoprogres.Dibatalkan.
+    """
+    try:
+        return hitung_metrik_audio(path_audio_asli, path_audio_stego, progres=progres, token=token)['psnr']
+    except Dibatalkan:
+        raise
+    except FileNotFoundError:
+        print(f"Error: Salah satu file tidak ditemukan.")
+        return None
+    except Exception as e:
+        print(f"Terjadi error saat menghitung PSNR: {e}")
+        return None
+
+def hitung_jendela_segmen(path_audio, awal_byte, akhir_byte, konteks=DURASI_KONTEKS,
+                          durasi_maks=DURASI_MAKS_SEGMEN):
+    """
+    Memetakan rentang byte file audio ke jendela waktu (offset, durasi) dalam detik, ditambah
+    `konteks` detik di kedua sisi. Untuk MP3, pemetaan memakai indeks frame (stegoframe), sehingga
+    tag ID3v2 dan VBR diperhitungkan; file tanpa frame MPEG dianggap berbitrate konstan dari byte 0.
+    """
+    from stegoframe import muat_indeks, byte_ke_waktu
+
+    indeks = muat_indeks(path_audio, simpan=False)
+    if len(indeks['posisi']):
+        data = np.memmap(path_audio, dtype=np.uint8, mode='r')
+        durasi_total = float(byte_ke_waktu(data, indeks, os.path.getsize(path_audio)))
+        t_awal, t_akhir = (float(t) for t in byte_ke_waktu(data, indeks, [awal_byte, akhir_byte]))
+    else:
+        import librosa
+
+        durasi_total = librosa.get_duration(path=path_audio)
+        ukuran = os.path.getsize(path_audio)
+        t_awal = durasi_total * awal_byte / ukuran
+        t_akhir = durasi_total * akhir_byte / ukuran
+
+    offset = max(0.0, t_awal - konteks)
+    durasi = min(t_akhir + konteks, durasi_total) - offset
+    return offset, max(0.0, min(durasi, durasi_maks))
+
+def _kerja_putar_segmen(daftar_segmen, offset, durasi):
+    """Dijalankan di thread latar belakang: dekode hanya jendela yang diminta lalu putar berurutan."""
+    try:
+        import librosa
+        import soundfile as sf
+        from playsound import playsound
+
+        with tempfile.TemporaryDirectory() as folder:
+            for label, path_audio in daftar_segmen:
+                audio, sr = librosa.load(path_audio, sr=None, mono=False, offset=offset, duration=durasi)
+                path_wav = os.path.join(folder, f"{label}.wav")
+                sf.write(path_wav, audio.T, sr)
+                print(f"\n🎵 [{label}] {path_audio} detik {offset:.2f}-{offset + durasi:.2f}")
+                playsound(path_wav)
+        print("\n✅ Selesai memutar pratinjau A/B.")
+    except Exception as e:
+        print(f"\n❌ Gagal memutar pratinjau: {e}")
+
+def putar_segmen_ab(path_cover, path_stego, awal_byte, akhir_byte, konteks=DURASI_KONTEKS,
+                    durasi_maks=DURASI_MAKS_SEGMEN):
+    """
+    Memutar potongan pendek cover (A) lalu stego (B) di sekitar rentang byte yang diubah,
+    di thread latar belakang agar menu tetap responsif. Mengembalikan thread pemutar.
+    """
+    # Posisi byte cover dan stego sama; struktur frame dibaca dari cover karena header frame stego
+    # bisa ikut berubah oleh penyisipan biasa
+    offset, durasi = hitung_jendela_segmen(path_cover, awal_byte, akhir_byte, konteks, durasi_maks)
+    thread = threading.Thread(target=_kerja_putar_segmen,
+                              args=([('A: cover', path_cover), ('B: stego', path_stego)], offset, durasi),
+                              daemon=True)
+    thread.start()
+    return thread
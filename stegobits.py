@@ -0,0 +1,128 @@
+import numpy as np
+
+# =============================================================
+# == DERET BIT TERKEMAS ==
+# =============================================================
+#
+# Pengganti string biner ('0101...') dan list bit: 8 bit per byte di atas bytearray,
+# urutan MSB dulu (sama dengan np.packbits dan format(x, '0Nb')). Bit padding di byte
+# terakhir selalu nol, sehingga dua deret dengan isi sama selalu punya byte yang sama.
+
+class DeretBit:
+    """Deret bit terkemas dengan penambahan field lebar tetap dan pemotongan di offset bit mana pun."""
+
+    __slots__ = ('_data', '_panjang')
+
+    def __init__(self, data=b'', panjang=None):
+        self._data = bytearray(data)
+        if panjang is None:
+            panjang = len(self._data) * 8
+        if not 0 <= panjang <= len(self._data) * 8:
+            raise ValueError("Panjang deret bit melebihi data.")
+        del self._data[(panjang + 7) // 8:]
+        self._panjang = panjang
+        self._nolkan_padding()
+
+    @classmethod
+    def dari_bit(cls, bits):
+        """Membuat deret dari array bit (0/1), misal hasil baca_lsb."""
+        bits = np.asarray(bits, dtype=np.uint8)
+        return cls(np.packbits(bits).tobytes(), len(bits))
+
+    def _nolkan_padding(self):
+        sisa = self._panjang % 8
+        if sisa:
+            self._data[-1] &= (0xFF << (8 - sisa)) & 0xFF
+
+    def __len__(self):
+        return self._panjang
+
+    def __bytes__(self):
+        return bytes(self._data)
+
+    def __eq__(self, lain):
+        if not isinstance(lain, DeretBit):
+            return NotImplemented
+        return self._panjang == lain._panjang and self._data == lain._data
+
+    def __repr__(self):
+        return f"DeretBit('{self.ke_biner()}')"
+
+    # ---------------------------------------------------------
+    # Penambahan
+    # ---------------------------------------------------------
+
+    def _tambah_terkemas(self, data, jumlah_bit):
+        """Menambahkan `jumlah_bit` bit pertama dari bytes `data` (MSB dulu, padding nol)."""
+        sisa = self._panjang % 8
+        if sisa == 0:
+            self._data += data[:(jumlah_bit + 7) // 8]
+        else:
+            # Deret belum genap per byte: bit baru disambung ke byte terakhir lalu dikemas ulang
+            ekor = np.unpackbits(np.frombuffer(bytes(self._data[-1:]), dtype=np.uint8), count=sisa)
+            bits = np.unpackbits(np.frombuffer(bytes(data), dtype=np.uint8), count=jumlah_bit)
+            del self._data[-1]
+            self._data += np.packbits(np.concatenate((ekor, bits))).tobytes()
+        self._panjang += jumlah_bit
+
+    def tambah(self, nilai, lebar):
+        """Menambahkan bilangan tak bertanda `nilai` sebagai field `lebar` bit. Mengembalikan self."""
+        nilai = int(nilai)
+        if not 0 <= nilai < 1 << lebar:
+            raise ValueError(f"Nilai {nilai} tidak muat dalam {lebar} bit.")
+        n_byte = (lebar + 7) // 8
+        self._tambah_terkemas((nilai << (n_byte * 8 - lebar)).to_bytes(n_byte, 'big'), lebar)
+        return self
+
+    def tambah_bytes(self, data):
+        """Menambahkan seluruh bit dari `data`. Mengembalikan self."""
+        self._tambah_terkemas(bytes(data), len(data) * 8)
+        return self
+
+    def tambah_deret(self, lain):
+        """Menambahkan isi DeretBit lain. Mengembalikan self."""
+        self._tambah_terkemas(lain._data, len(lain))
+        return self
+
+    # ---------------------------------------------------------
+    # Pembacaan
+    # ---------------------------------------------------------
+
+    def ambil(self, awal, lebar):
+        """Nilai field `lebar` bit mulai dari bit ke-`awal`, sebagai bilangan tak bertanda."""
+        if awal < 0 or lebar < 0 or awal + lebar > self._panjang:
+            raise IndexError("Field di luar deret bit.")
+        if lebar == 0:
+            return 0
+        a, b = awal // 8, (awal + lebar + 7) // 8
+        nilai = int.from_bytes(self._data[a:b], 'big')
+        return (nilai >> (b * 8 - awal - lebar)) & ((1 << lebar) - 1)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            awal, akhir, langkah = k.indices(self._panjang)
+            if langkah != 1:
+                raise ValueError("DeretBit hanya mendukung potongan dengan langkah 1.")
+            return self._potong(awal, max(awal, akhir))
+        if k < 0:
+            k += self._panjang
+        if not 0 <= k < self._panjang:
+            raise IndexError("Indeks bit di luar deret.")
+        return self.ambil(k, 1)
+
+    def _potong(self, awal, akhir):
+        jumlah_bit = akhir - awal
+        a, b = awal // 8, (akhir + 7) // 8
+        if awal % 8 == 0:
+            return DeretBit(self._data[a:b], jumlah_bit)
+        bits = np.unpackbits(np.frombuffer(bytes(self._data[a:b]), dtype=np.uint8))
+        bits = bits[awal % 8:awal % 8 + jumlah_bit]
+        return DeretBit(np.packbits(bits).tobytes(), jumlah_bit)
+
+    def ke_bit(self):
+        """Array bit (0/1, uint8) untuk kernel LSB."""
+        return np.unpackbits(np.frombuffer(bytes(self._data), dtype=np.uint8), count=self._panjang)
+
+    def ke_biner(self):
+        """String biner ('0101...'), untuk tampilan dan debug."""
+        return (self.ke_bit() + ord('0')).tobytes().decode('ascii')
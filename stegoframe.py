@@ -0,0 +1,335 @@
+import hashlib
+import io
+import numpy as np
+from stegostream import UKURAN_CHUNK, FLAG_FRAME, baca_header_spesial
+
+# =============================================================
+# == INDEKS FRAME MP3 ==
+# =============================================================
+#
+# final.py memperlakukan MP3 sebagai deretan byte biasa, sehingga penyisipan dari byte 0
+# ikut mengubah tag ID3 dan header frame. Modul ini memindai struktur MP3:
+#
+#   - tag ID3v2 di awal file dan tag ID3v1 ('TAG', 128 byte) di akhir file
+#   - kandidat sync word (11 bit 1) dicari sekaligus dengan NumPy, field header
+#     didekode secara vektor, lalu rantai frame divalidasi dengan panjang frame
+#     (frame berikutnya harus tepat di posisi + panjang)
+#
+# Untuk tiap frame Layer III, byte header, CRC, dan side information dilindungi; sisanya
+# (main data) boleh disisipi. Frame Xing/Info/VBRI (tabel VBR) dilindungi seluruhnya.
+#
+# Indeks disimpan sebagai sidecar '<file>.frameidx.npz' bersama hash isi file, sehingga
+# pemanggilan berikutnya cukup memuat sidecar, bukan memindai ulang.
+
+EKSTENSI_SIDECAR = '.frameidx.npz'
+VERSI_SIDECAR = 1
+
+# Tabel bitrate (kbps) per [versi MPEG 1 / 2 & 2.5][layer I, II, III][indeks bitrate]
+_BITRATE = np.array([
+    [[0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448, 0],
+     [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384, 0],
+     [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0]],
+    [[0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256, 0],
+     [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0],
+     [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0]],
+], dtype=np.int64)
+
+# Sample rate per field versi (0: MPEG 2.5, 1: cadangan, 2: MPEG 2, 3: MPEG 1) dan indeks
+_SAMPLE_RATE = np.array([
+    [11025, 12000, 8000, 0],
+    [0, 0, 0, 0],
+    [22050, 24000, 16000, 0],
+    [44100, 48000, 32000, 0],
+], dtype=np.int64)
+
+# Sampel per frame per [versi MPEG 1 / 2 & 2.5][layer I, II, III]
+_SAMPEL_PER_FRAME = np.array([[384, 1152, 1152], [384, 1152, 576]], dtype=np.int64)
+
+# =============================================================
+# == PEMINDAIAN ==
+# =============================================================
+
+def ukuran_id3v2(data):
+    """Panjang tag ID3v2 di awal data (0 jika tidak ada), termasuk footer jika ada."""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    ukuran = 0
+    for byte in data[6:10]:
+        # Ukuran ditulis "syncsafe": 7 bit per byte
+        ukuran = (ukuran << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + ukuran + footer
+
+def _dekode_header(b1, b2, b3):
+    """Mendekode field header frame secara vektor. Mengembalikan (valid, panjang_frame, terlindungi)."""
+    versi = (b1 >> 3) & 3
+    layer = (b1 >> 1) & 3
+    tanpa_crc = b1 & 1
+    indeks_bitrate = b2 >> 4
+    indeks_rate = (b2 >> 2) & 3
+    padding = (b2 >> 1) & 1
+    mono = (b3 >> 6) == 3
+
+    valid = (versi != 1) & (layer != 0) & (indeks_bitrate != 0) & (indeks_bitrate != 15) & (indeks_rate != 3)
+    mpeg1 = versi == 3
+    baris_layer = np.where(valid, 3 - layer, 0) # layer I -> 0, II -> 1, III -> 2
+    bitrate = _BITRATE[np.where(mpeg1, 0, 1), baris_layer, indeks_bitrate] * 1000
+    sample_rate = _SAMPLE_RATE[versi, indeks_rate]
+    sample_rate = np.where(sample_rate == 0, 1, sample_rate)
+
+    layer3 = baris_layer == 2
+    panjang = np.where(
+        baris_layer == 0,
+        (12 * bitrate // sample_rate + padding) * 4,
+        np.where(layer3 & ~mpeg1, 72, 144) * bitrate // sample_rate + padding,
+    )
+
+    # Header (4) + CRC (2, jika ada) + side information Layer III
+    side_info = np.where(mpeg1, np.where(mono, 17, 32), np.where(mono, 9, 17))
+    terlindungi = 4 + np.where(tanpa_crc == 0, 2, 0) + np.where(layer3, side_info, 0)
+    # Hanya frame Layer III yang disisipi; frame Layer I/II dilindungi seluruhnya
+    terlindungi = np.where(layer3, terlindungi, panjang)
+
+    valid &= panjang > terlindungi.clip(max=4)
+    return valid, panjang, terlindungi
+
+def _frame_vbr(data, posisi, terlindungi):
+    """True jika frame di `posisi` adalah frame info VBR (Xing/Info/VBRI)."""
+    awal_tag = posisi + terlindungi
+    if data[awal_tag:awal_tag + 4].tobytes() in (b'Xing', b'Info'):
+        return True
+    return data[posisi + 36:posisi + 40].tobytes() == b'VBRI'
+
+def pindai_frame(data):
+    """
+    Memindai MP3 (array uint8) dan mengembalikan indeks frame:
+    dict berisi array 'posisi', 'panjang', 'terlindungi' dan ukuran tag 'id3v2', 'id3v1'.
+    """
+    n = len(data)
+    id3v2 = ukuran_id3v2(data[:10].tobytes())
+    id3v1 = 128 if n - id3v2 >= 128 and data[n - 128:n - 125].tobytes() == b'TAG' else 0
+    akhir = n - id3v1
+
+    # Kandidat sync word: 0xFF diikuti 3 bit 1, dicari sekaligus untuk seluruh file
+    kandidat = np.flatnonzero((data[id3v2:akhir - 3] == 0xFF) & ((data[id3v2 + 1:akhir - 2] & 0xE0) == 0xE0)) + id3v2
+    valid, panjang, terlindungi = _dekode_header(data[kandidat + 1].astype(np.int64),
+                                                 data[kandidat + 2].astype(np.int64),
+                                                 data[kandidat + 3].astype(np.int64))
+    kandidat, panjang, terlindungi = kandidat[valid], panjang[valid], terlindungi[valid]
+
+    # Tabel posisi -> urutan kandidat, agar "apakah ada header valid di posisi x" menjadi O(1)
+    urutan_di = np.full(akhir + 1, -1, dtype=np.int64)
+    urutan_di[kandidat] = np.arange(len(kandidat))
+
+    def berikut(i):
+        nxt = kandidat[i] + panjang[i]
+        if nxt == akhir:
+            return len(kandidat) # frame terakhir pas di akhir audio
+        return urutan_di[nxt] if nxt < akhir else -1
+
+    hasil = []
+    i = 0
+    while i < len(kandidat):
+        j = berikut(i)
+        # Frame pertama sebuah rantai harus diikuti frame valid (atau akhir file)
+        if j < 0:
+            i += 1
+            continue
+        while True:
+            hasil.append(i)
+            if j < 0 or j >= len(kandidat):
+                break
+            i, j = j, berikut(j)
+        if j >= len(kandidat):
+            break
+        # Rantai putus: lanjut memindai setelah frame terakhir yang valid
+        i = int(np.searchsorted(kandidat, kandidat[i] + panjang[i]))
+
+    hasil = np.array(hasil, dtype=np.int64)
+    indeks = {
+        'posisi': kandidat[hasil],
+        'panjang': panjang[hasil],
+        'terlindungi': terlindungi[hasil],
+        'id3v2': id3v2,
+        'id3v1': id3v1,
+    }
+    if len(hasil) and _frame_vbr(data, int(indeks['posisi'][0]), int(indeks['terlindungi'][0])):
+        indeks['terlindungi'][0] = indeks['panjang'][0]
+    return indeks
+
+def waktu_frame(data, indeks):
+    """
+    Waktu awal (detik) tiap frame dalam indeks, ditambah durasi total sebagai elemen terakhir.
+    Sample rate dan jumlah sampel dibaca dari header tiap frame, sehingga benar juga untuk VBR.
+    """
+    posisi = indeks['posisi']
+    b1, b2 = data[posisi + 1].astype(np.int64), data[posisi + 2].astype(np.int64)
+    versi = (b1 >> 3) & 3
+    sampel = _SAMPEL_PER_FRAME[np.where(versi == 3, 0, 1), 3 - ((b1 >> 1) & 3)]
+    return np.concatenate(([0.0], np.cumsum(sampel / _SAMPLE_RATE[versi, (b2 >> 2) & 3])))
+
+def byte_ke_waktu(data, indeks, posisi_byte):
+    """
+    Memetakan posisi byte ke waktu (detik) lewat indeks frame: awal frame yang memuat byte itu,
+    diinterpolasi di dalam frame. Byte sebelum frame pertama (tag ID3v2) menjadi 0.
+    """
+    waktu = waktu_frame(data, indeks)
+    posisi_byte = np.asarray(posisi_byte)
+    i = np.searchsorted(indeks['posisi'], posisi_byte, side='right') - 1
+    aman = i.clip(min=0)
+    pecahan = ((posisi_byte - indeks['posisi'][aman]) / indeks['panjang'][aman]).clip(0, 1)
+    return np.where(i < 0, 0.0, waktu[aman] + pecahan * (waktu[aman + 1] - waktu[aman]))
+
+# =============================================================
+# == SIDECAR ==
+# =============================================================
+
+def hash_file(path):
+    """Hash isi file (BLAKE2b 128-bit), dibaca per chunk."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(UKURAN_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def path_sidecar(path):
+    return path + EKSTENSI_SIDECAR
+
+def muat_indeks(path, simpan=True):
+    """
+    Mengembalikan indeks frame file MP3. Sidecar dipakai jika hash-nya cocok dengan isi
+    file; jika tidak, file dipindai ulang dan sidecar ditulis (jika `simpan`).
+    """
+    kunci = hash_file(path)
+    sidecar = path_sidecar(path)
+    try:
+        with np.load(sidecar) as arsip:
+            if int(arsip['versi']) == VERSI_SIDECAR and str(arsip['hash']) == kunci:
+                return {nama: arsip[nama] if arsip[nama].ndim else int(arsip[nama])
+                        for nama in ('posisi', 'panjang', 'terlindungi', 'id3v2', 'id3v1')}
+    except (OSError, KeyError, ValueError):
+        pass
+
+    indeks = pindai_frame(np.fromfile(path, dtype=np.uint8))
+    if simpan:
+        try:
+            # np.savez menambahkan '.npz' jika nama file belum berakhiran .npz
+            np.savez_compressed(sidecar, versi=VERSI_SIDECAR, hash=kunci, **indeks)
+        except OSError:
+            pass # direktori read-only: indeks tetap dipakai, hanya tidak disimpan
+    return indeks
+
+def rentang_aman(indeks):
+    """Daftar rentang byte [awal, akhir) yang aman disisipi (main data tiap frame), sebagai array (n, 2)."""
+    awal = indeks['posisi'] + indeks['terlindungi']
+    akhir = indeks['posisi'] + indeks['panjang']
+    dipakai = akhir > awal
+    return np.stack([awal[dipakai], akhir[dipakai]], axis=1)
+
+def kapasitas_aman(indeks):
+    """Jumlah byte cover yang aman disisipi."""
+    return int((indeks['panjang'] - indeks['terlindungi']).clip(min=0).sum())
+
+# =============================================================
+# == TAMPILAN FILE ATAS BYTE YANG AMAN ==
+# =============================================================
+
+class TampilanFrame:
+    """
+    File-like (read/write/seek/tell) yang hanya memperlihatkan byte-byte aman sebuah MP3,
+    disambung berurutan. Mesin streaming di stegostream.py dapat dipakai apa adanya di atasnya.
+    """
+
+    def __init__(self, f, rentang):
+        self.f = f
+        self.awal = rentang[:, 0]
+        self.panjang = rentang[:, 1] - rentang[:, 0]
+        # Offset virtual awal tiap rentang
+        self.offset = np.concatenate(([0], np.cumsum(self.panjang)))
+        self.ukuran = int(self.offset[-1])
+        self.posisi = 0
+
+    def seek(self, posisi, dari=0):
+        self.posisi = posisi if dari == 0 else (self.posisi + posisi if dari == 1 else self.ukuran + posisi)
+        return self.posisi
+
+    def tell(self):
+        return self.posisi
+
+    def _potongan(self, n):
+        """Rentang fisik yang mencakup n byte virtual mulai dari posisi sekarang."""
+        a = self.posisi
+        b = min(self.ukuran, a + n)
+        if b <= a:
+            return None
+        i = int(np.searchsorted(self.offset, a, side='right')) - 1
+        j = int(np.searchsorted(self.offset, b, side='left'))
+        awal = self.awal[i:j].copy()
+        akhir = awal + self.panjang[i:j]
+        awal[0] += a - self.offset[i]
+        akhir[-1] -= self.offset[j] - b
+        return awal, akhir
+
+    def read(self, n=-1):
+        potongan = self._potongan(self.ukuran if n is None or n < 0 else n)
+        if potongan is None:
+            return b''
+        awal, akhir = potongan
+        # Satu pembacaan berurutan untuk seluruh bentang fisik, lalu header frame dibuang
+        self.f.seek(int(awal[0]))
+        bentang = np.frombuffer(self.f.read(int(akhir[-1] - awal[0])), dtype=np.uint8)
+        dasar = awal[0]
+        hasil = b''.join(bentang[a - dasar:b - dasar].tobytes() for a, b in zip(awal, akhir))
+        self.posisi += len(hasil)
+        return hasil
+
+    def write(self, data):
+        potongan = self._potongan(len(data))
+        if potongan is None:
+            if len(data):
+                raise ValueError("Penulisan melewati akhir region aman MP3.")
+            return 0
+        awal, akhir = potongan
+        self.f.seek(int(awal[0]))
+        bentang = bytearray(self.f.read(int(akhir[-1] - awal[0])))
+        dasar = int(awal[0])
+        sumber = 0
+        for a, b in zip(awal, akhir):
+            a, b = int(a) - dasar, int(b) - dasar
+            bentang[a:b] = data[sumber:sumber + b - a]
+            sumber += b - a
+        self.f.seek(dasar)
+        self.f.write(bentang)
+        self.posisi += sumber
+        return sumber
+
+    def flush(self):
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Banyak byte awal (setelah tag ID3v2) yang dipindai untuk mendeteksi mode aman-frame;
+# header spesial selalu muat di main data beberapa frame pertama.
+UKURAN_PRATINJAU = 1 << 16
+
+def adalah_stego_frame(f_stego):
+    """True jika header spesial ditemukan di byte aman frame MP3 dengan flag FLAG_FRAME."""
+    f_stego.seek(0)
+    awal = f_stego.read(10)
+    f_stego.seek(0)
+    data = np.frombuffer(f_stego.read(ukuran_id3v2(awal) + UKURAN_PRATINJAU), dtype=np.uint8)
+    indeks = pindai_frame(data)
+    if len(indeks['posisi']) == 0:
+        return False
+    try:
+        _, _, _, flags, _, _ = baca_header_spesial(TampilanFrame(io.BytesIO(data.tobytes()), rentang_aman(indeks)))
+    except ValueError:
+        return False
+    return bool(flags & FLAG_FRAME)
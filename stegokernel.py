@@ -0,0 +1,267 @@
+import json
+import os
+import platform
+import time
+import numpy as np
+
+# =============================================================
+# == KERNEL LSB ==
+# =============================================================
+#
+# Satu antarmuka untuk "sisipkan bit ke m LSB tiap elemen buffer" dan kebalikannya,
+# dipakai oleh semua penyisip (byte mentah MP3 di final.py/stegomp3.py dan sampel
+# int16 di coba.py). Tersedia beberapa backend:
+#
+#   python : implementasi referensi, murni loop Python
+#   numpy  : versi vektor NumPy
+#   numba  : versi JIT, hanya jika paket numba terpasang
+#
+# Backend tercepat dipilih dengan micro-benchmark saat kernel pertama kali dipakai untuk
+# buffer besar, lalu pilihannya disimpan di cache per mesin dan versi numpy/numba sehingga
+# proses berikutnya tidak mengulang benchmark (dan tidak meng-import numba jika numba kalah).
+# Buffer kecil selalu memakai numpy tanpa memilih backend: import numba saja sekitar 0.3 s,
+# jauh lebih mahal daripada pekerjaannya. Variabel lingkungan STEGO_KERNEL=<nama> memaksa
+# backend tertentu.
+#
+# msb_dulu=True  : bit pertama tiap kelompok m ditaruh di posisi tertinggi (final.py)
+# msb_dulu=False : bit pertama ditaruh di bit 0 / LSB (coba.py)
+
+ENV_KERNEL = 'STEGO_KERNEL'
+UKURAN_BENCHMARK = 4096
+# Panggilan dengan elemen lebih sedikit dari ini memakai numpy sebelum backend dipilih
+BATAS_KERNEL_KECIL = 1 << 20
+NAMA_CACHE_KERNEL = os.path.join('stego', 'kernel.json')
+
+def _tampilan_unsigned(buffer):
+    """Operasi bit dikerjakan pada tampilan unsigned agar sampel negatif (int16) tidak bermasalah."""
+    if buffer.dtype.kind == 'i':
+        return buffer.view(np.dtype(f'u{buffer.dtype.itemsize}'))
+    return buffer
+
+def _posisi_bit(m, msb_dulu):
+    """Posisi bit (dari LSB) untuk bit ke-0..m-1 dalam satu kelompok."""
+    return list(range(m - 1, -1, -1)) if msb_dulu else list(range(m))
+
+# -------------------------------------------------------------
+# Backend: python (referensi)
+# -------------------------------------------------------------
+
+def _sisip_python(target, bits, m, msb_dulu):
+    posisi = _posisi_bit(m, msb_dulu)
+    for i in range(0, len(bits), m):
+        nilai = int(target[i // m])
+        for j, bit in enumerate(bits[i:i + m]):
+            nilai = (nilai & ~(1 << posisi[j])) | (int(bit) << posisi[j])
+        target[i // m] = nilai
+
+def _baca_python(sumber, m, msb_dulu):
+    posisi = _posisi_bit(m, msb_dulu)
+    return np.array([(int(nilai) >> p) & 1 for nilai in sumber for p in posisi], dtype=np.uint8)
+
+# -------------------------------------------------------------
+# Backend: numpy
+# -------------------------------------------------------------
+
+def _sisip_numpy(target, bits, m, msb_dulu):
+    posisi = _posisi_bit(m, msb_dulu)
+    bobot = 1 << np.array(posisi, dtype=np.int64)
+    n_penuh = len(bits) // m
+    if n_penuh:
+        # Disusun per kolom agar array sementara tetap seukuran target, bukan m x int64 per elemen
+        kelompok = bits[:n_penuh * m].reshape(n_penuh, m)
+        nilai = np.zeros(n_penuh, dtype=target.dtype)
+        for j, p in enumerate(posisi):
+            nilai |= kelompok[:, j].astype(target.dtype) << target.dtype.type(p)
+        mask = target.dtype.type(~((1 << m) - 1) & np.iinfo(target.dtype).max)
+        target[:n_penuh] = (target[:n_penuh] & mask) | nilai
+
+    # Kelompok terakhir bisa hanya terisi sebagian; bit lain dibiarkan
+    r = len(bits) - n_penuh * m
+    if r:
+        bobot_sisa = bobot[:r]
+        nilai = int((bits[n_penuh * m:] * bobot_sisa).sum())
+        mask = ~int(bobot_sisa.sum())
+        target[n_penuh] = (int(target[n_penuh]) & mask) | nilai
+
+def _baca_numpy(sumber, m, msb_dulu):
+    geser = np.array(_posisi_bit(m, msb_dulu), dtype=sumber.dtype)
+    return ((sumber[:, None] >> geser) & 1).astype(np.uint8).ravel()
+
+# -------------------------------------------------------------
+# Backend: numba (opsional)
+# -------------------------------------------------------------
+
+def _buat_backend_numba():
+    """Mengompilasi kernel numba. Mengembalikan None jika numba tidak tersedia."""
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(cache=True)
+    def sisip(target, bits, m, msb_dulu):
+        for i in range(len(bits)):
+            j = i % m
+            p = m - 1 - j if msb_dulu else j
+            k = i // m
+            target[k] = (target[k] & ~(1 << p)) | (bits[i] << p)
+
+    @numba.njit(cache=True)
+    def baca(sumber, m, msb_dulu, hasil):
+        for k in range(len(sumber)):
+            for j in range(m):
+                p = m - 1 - j if msb_dulu else j
+                hasil[k * m + j] = (sumber[k] >> p) & 1
+
+    def _baca(sumber, m, msb_dulu):
+        hasil = np.empty(len(sumber) * m, dtype=np.uint8)
+        baca(sumber, m, msb_dulu, hasil)
+        return hasil
+
+    def _sisip(target, bits, m, msb_dulu):
+        sisip(target, bits.astype(target.dtype), m, msb_dulu)
+
+    return _sisip, _baca
+
+# =============================================================
+# == PEMILIHAN BACKEND ==
+# =============================================================
+
+_BACKEND = {
+    'python': (_sisip_python, _baca_python),
+    'numpy': (_sisip_numpy, _baca_numpy),
+}
+_backend_aktif = None
+
+def daftar_backend():
+    """Mengembalikan dict nama -> (sisip, baca) untuk semua backend yang tersedia di mesin ini."""
+    if 'numba' not in _BACKEND:
+        backend_numba = _buat_backend_numba()
+        if backend_numba:
+            _BACKEND['numba'] = backend_numba
+    return dict(_BACKEND)
+
+def benchmark_backend(ukuran=UKURAN_BENCHMARK, ulang=3):
+    """Mengukur waktu (detik) satu putaran sisip + baca tiap backend. Mengembalikan dict nama -> waktu."""
+    rng = np.random.default_rng(0)
+    cover = rng.integers(0, 256, ukuran, dtype=np.uint8)
+    bits = rng.integers(0, 2, ukuran * 2, dtype=np.uint8)
+
+    hasil = {}
+    for nama, (sisip, baca) in daftar_backend().items():
+        # Putaran pertama sekaligus pemanasan (kompilasi JIT)
+        target = cover.copy()
+        sisip(target, bits, 2, True)
+        baca(target, 2, True)
+
+        terbaik = float('inf')
+        for _ in range(ulang):
+            target = cover.copy()
+            mulai = time.perf_counter()
+            sisip(target, bits, 2, True)
+            baca(target, 2, True)
+            terbaik = min(terbaik, time.perf_counter() - mulai)
+        hasil[nama] = terbaik
+    return hasil
+
+def _path_cache():
+    folder = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(folder, NAMA_CACHE_KERNEL)
+
+def _kunci_cache():
+    """Hasil benchmark hanya berlaku untuk mesin, Python, numpy, dan numba yang sama."""
+    from importlib import metadata
+    try:
+        versi_numba = metadata.version('numba')
+    except metadata.PackageNotFoundError:
+        versi_numba = None
+    return '|'.join([platform.node(), platform.machine(), platform.python_version(),
+                     f'numpy {np.__version__}', f'numba {versi_numba}'])
+
+def _baca_cache():
+    try:
+        with open(_path_cache()) as f:
+            isi = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return isi if isinstance(isi, dict) else {}
+
+def _simpan_cache(kunci, nama):
+    """Menyimpan pilihan backend; cache yang tidak bisa ditulis hanya berarti benchmark diulang."""
+    path = _path_cache()
+    isi = _baca_cache()
+    isi[kunci] = nama
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        sementara = f"{path}.{os.getpid()}.tmp"
+        with open(sementara, 'w') as f:
+            json.dump(isi, f)
+        os.replace(sementara, path)
+    except OSError:
+        pass
+
+def backend_aktif():
+    """Nama backend yang dipakai; dipilih sekali (override STEGO_KERNEL, cache, atau benchmark)."""
+    global _backend_aktif
+    if _backend_aktif is None:
+        paksa = os.environ.get(ENV_KERNEL)
+        if paksa:
+            tersedia = daftar_backend()
+            if paksa not in tersedia:
+                raise ValueError(f"Backend kernel '{paksa}' tidak tersedia. Pilihan: {', '.join(tersedia)}")
+            _backend_aktif = paksa
+            return _backend_aktif
+
+        kunci = _kunci_cache()
+        tersimpan = _baca_cache().get(kunci)
+        # numba hanya di-import jika memang backend itu yang tersimpan
+        if tersimpan in _BACKEND or (tersimpan == 'numba' and 'numba' in daftar_backend()):
+            # Seperti putaran pertama benchmark: kode JIT dimuat sekarang, bukan di tengah pekerjaan pertama
+            sisip, baca = _BACKEND[tersimpan]
+            target = np.zeros(8, dtype=np.uint8)
+            sisip(target, np.zeros(16, dtype=np.uint8), 2, True)
+            baca(target, 2, True)
+            _backend_aktif = tersimpan
+        else:
+            waktu = benchmark_backend()
+            _backend_aktif = min(waktu, key=waktu.get)
+            _simpan_cache(kunci, _backend_aktif)
+    return _backend_aktif
+
+def _kernel(n_elemen):
+    """(sisip, baca) untuk panggilan dengan n_elemen; buffer kecil tidak memicu pemilihan backend."""
+    if _backend_aktif is None and n_elemen < BATAS_KERNEL_KECIL and not os.environ.get(ENV_KERNEL):
+        return _BACKEND['numpy']
+    return _BACKEND[backend_aktif()]
+
+def pilih_backend(nama):
+    """Memaksa backend tertentu untuk sisa proses ini."""
+    global _backend_aktif
+    if nama not in daftar_backend():
+        raise ValueError(f"Backend kernel '{nama}' tidak tersedia.")
+    _backend_aktif = nama
+
+# =============================================================
+# == ANTARMUKA KERNEL ==
+# =============================================================
+
+def sisip_lsb(target, bits, m, msb_dulu=True):
+    """
+    Menyisipkan array bit (0/1) ke m LSB tiap elemen `target` (uint8/int16) secara in-place.
+    Elemen terakhir boleh hanya terisi sebagian.
+    """
+    if len(bits) == 0:
+        return
+    sisip, _ = _kernel(-(-len(bits) // m))
+    sisip(_tampilan_unsigned(target), np.asarray(bits, dtype=np.uint8), m, msb_dulu)
+
+def baca_lsb(sumber, m, msb_dulu=True):
+    """Membaca m LSB tiap elemen `sumber` (uint8/int16) menjadi array bit (0/1)."""
+    sumber = np.asarray(sumber)
+    _, baca = _kernel(len(sumber))
+    return baca(_tampilan_unsigned(sumber), m, msb_dulu)
+
+if __name__ == "__main__":
+    for nama, waktu in sorted(benchmark_backend().items(), key=lambda item: item[1]):
+        print(f"{nama:>8}: {waktu * 1e6:10.1f} µs")
+    print(f"Backend terpilih: {backend_aktif()}")
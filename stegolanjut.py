@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+from stegostream import (UKURAN_CHUNK, FLAG_KEYSTREAM, FLAG_CRC, _header_sisip, _tata_letak_sisip,
+                         byte_pesan_tertanam, lanjutkan_stream)
+
+# =============================================================
+# == PENYISIPAN YANG DAPAT DILANJUTKAN (TITIK SIMPAN) ==
+# =============================================================
+#
+# Penyisipan ke cover besar mencatat titik simpan '<stego>.lanjut.json' setiap INTERVAL_TITIK_SIMPAN
+# byte output: parameter job, nonce, posisi output yang sudah di-fsync, serta hash awalan cover dan
+# pesan yang sudah terbaca. Jika proses mati di tengah jalan, menjalankan ulang dengan `lanjutkan`
+# memeriksa parameter dan awalan kedua input, memotong output ke posisi tercatat, lalu meneruskan
+# dari sana. Byte output [0, posisi) hanya bergantung pada awalan yang diperiksa, sehingga hasilnya
+# sama byte demi byte dengan penyisipan tanpa putus atas input yang sama.
+#
+# Kunci tidak disimpan; yang disimpan hanya BLAKE2b kunci dengan garam acak untuk menolak kunci lain.
+
+EKSTENSI_TITIK_SIMPAN = '.lanjut.json'
+VERSI_TITIK_SIMPAN = 1
+
+# Cover sekecil ini selesai dalam hitungan detik; tidak perlu titik simpan
+BATAS_TITIK_SIMPAN = 256 << 20
+INTERVAL_TITIK_SIMPAN = 64 << 20
+
+def path_titik_simpan(file_stego):
+    return file_stego + EKSTENSI_TITIK_SIMPAN
+
+def _hash_kunci(key, garam):
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16, salt=garam).hexdigest()
+
+class _PembacaBerhash:
+    """Membungkus file baca: setiap byte yang terbaca ikut di-hash (BLAKE2b) dan dihitung."""
+
+    def __init__(self, f, h=None, terbaca=0):
+        self.f = f
+        self.h = h if h is not None else hashlib.blake2b(digest_size=16)
+        self.terbaca = terbaca
+        # Pada mode pipa, cover dibaca di thread latar sementara titik simpan diambil di thread utama
+        self._kunci = threading.Lock()
+
+    def read(self, n=-1):
+        data = self.f.read(n)
+        with self._kunci:
+            self.h.update(data)
+            self.terbaca += len(data)
+        return data
+
+    def sidik(self):
+        """(jumlah byte terbaca, hash awalan yang terbaca) pada saat ini."""
+        with self._kunci:
+            return {'terbaca': self.terbaca, 'hash': self.h.hexdigest()}
+
+def _periksa_awalan(f, sidik, posisi, dengan_crc=False):
+    """
+    Membaca ulang f[0, sidik['terbaca']) dan mencocokkan hash-nya. Mengembalikan
+    (state hash f[:posisi], CRC32 f[:posisi]); f berada di `posisi` sesudahnya.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h_posisi = None
+    crc = 0
+    terbaca = 0
+    f.seek(0)
+    while terbaca < sidik['terbaca']:
+        if terbaca == posisi:
+            h_posisi = h.copy()
+        # Potongan berhenti tepat di `posisi` agar state hash di titik itu bisa disalin
+        batas = posisi if terbaca < posisi else sidik['terbaca']
+        data = f.read(min(UKURAN_CHUNK, batas - terbaca))
+        if not data:
+            break
+        h.update(data)
+        if dengan_crc and terbaca < posisi:
+            crc = zlib.crc32(data, crc)
+        terbaca += len(data)
+    if terbaca == posisi and h_posisi is None:
+        h_posisi = h.copy()
+    if terbaca != sidik['terbaca'] or h.hexdigest() != sidik['hash']:
+        raise ValueError("Isi file input berubah sejak titik simpan dibuat.")
+    f.seek(posisi)
+    return h_posisi, crc
+
+class _PencatatTitikSimpan:
+    """Dipanggil setelah setiap chunk; setiap `interval` byte output di-fsync lalu titik simpan ditulis."""
+
+    def __init__(self, path, job, f_output, cover, pesan, posisi, interval):
+        self.path = path
+        self.job = job
+        self.f_output = f_output
+        self.cover = cover
+        self.pesan = pesan
+        self.terakhir = posisi
+        self.interval = interval
+
+    def __call__(self, tertulis):
+        if tertulis - self.terakhir < self.interval:
+            return
+        # Sidik diambil sebelum fsync: awalan yang sudah terbaca selalu mencakup byte yang tertulis
+        catatan = dict(self.job, posisi=tertulis, cover=self.cover.sidik(), pesan=self.pesan.sidik())
+        self.f_output.flush()
+        os.fsync(self.f_output.fileno())
+        sementara = self.path + '.tmp'
+        with open(sementara, 'w') as f:
+            json.dump(catatan, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(sementara, self.path)
+        self.terakhir = tertulis
+
+def _job(ukuran_cover, panjang_pesan, isEncrypt, isRandom, m, key, tipe, flags, nonce):
+    garam = os.urandom(16)
+    return {
+        'versi': VERSI_TITIK_SIMPAN,
+        'ukuran_cover': ukuran_cover,
+        'panjang_pesan': panjang_pesan,
+        'isEncrypt': bool(isEncrypt),
+        'isRandom': bool(isRandom),
+        'm': m,
+        'tipe': tipe,
+        'flags': flags,
+        'nonce': nonce.hex() if nonce is not None else None,
+        'garam': garam.hex(),
+        'kunci': _hash_kunci(key, garam),
+    }
+
+def _muat_titik_simpan(path, ukuran_cover, panjang_pesan, isEncrypt, isRandom, m, key, tipe, flags):
+    """Membaca titik simpan dan memastikan parameternya sama dengan job yang diminta."""
+    try:
+        with open(path) as f:
+            catatan = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Titik simpan '{path}' tidak dapat dibaca: {e}")
+
+    if catatan.get('versi') != VERSI_TITIK_SIMPAN:
+        raise ValueError("Versi titik simpan tidak dikenal.")
+    diminta = {'ukuran_cover': ukuran_cover, 'panjang_pesan': panjang_pesan, 'isEncrypt': bool(isEncrypt),
+               'isRandom': bool(isRandom), 'm': m, 'tipe': tipe, 'flags': flags}
+    for nama, nilai in diminta.items():
+        if catatan[nama] != nilai:
+            raise ValueError(f"Parameter '{nama}' berbeda dengan job yang terputus ({catatan[nama]!r}, bukan {nilai!r}).")
+    if _hash_kunci(key, bytes.fromhex(catatan['garam'])) != catatan['kunci']:
+        raise ValueError("Kunci berbeda dengan job yang terputus.")
+    return catatan
+
+def sisipkan_berlanjut(file_cover, file_pesan, file_stego, isEncrypt, isRandom, m, key, tipe, flags=0, pipa=False,
+                       lanjutkan=False, ukuran_chunk=UKURAN_CHUNK, interval=INTERVAL_TITIK_SIMPAN, progres=None):
+    """
+    Seperti sisipkan_stream dari file ke file, dengan titik simpan berkala di samping file_stego.
+    Dengan `lanjutkan` dan titik simpan yang ada, penyisipan diteruskan dari posisi tercatat;
+    tanpa titik simpan, penyisipan dimulai dari awal. Titik simpan dihapus setelah selesai; jika
+    `progres` membatalkan operasi, titik simpan tetap ada sehingga job bisa dilanjutkan.
+    Mengembalikan posisi awal penyisipan (0 jika mulai dari awal).
+    """
+    if not isEncrypt:
+        flags &= ~FLAG_KEYSTREAM
+    path = path_titik_simpan(file_stego)
+    ukuran_cover = os.path.getsize(file_cover)
+    panjang_pesan = os.path.getsize(file_pesan)
+
+    with open(file_cover, 'rb') as f_cover, open(file_pesan, 'rb') as f_pesan:
+        if lanjutkan and os.path.exists(path):
+            job = _muat_titik_simpan(path, ukuran_cover, panjang_pesan, isEncrypt, isRandom, m, key, tipe, flags)
+            posisi = job.pop('posisi')
+            sidik_cover, sidik_pesan = job.pop('cover'), job.pop('pesan')
+            if not os.path.exists(file_stego) or os.path.getsize(file_stego) < posisi:
+                raise ValueError(f"File output '{file_stego}' lebih pendek dari posisi titik simpan.")
+            nonce = bytes.fromhex(job['nonce']) if job['nonce'] else None
+        else:
+            job, posisi, nonce = None, 0, None
+
+        # Nonce dari titik simpan dipakai ulang agar sisa payload terenkripsi dengan keystream yang sama
+        header = _header_sisip(panjang_pesan, isRandom, m, flags, nonce)
+        rencana = _tata_letak_sisip(header, ukuran_cover, key)
+        mulai_pesan = byte_pesan_tertanam(rencana, posisi, panjang_pesan)
+
+        if job is not None:
+            h_cover, _ = _periksa_awalan(f_cover, sidik_cover, posisi)
+            h_pesan, crc = _periksa_awalan(f_pesan, sidik_pesan, mulai_pesan, bool(flags & FLAG_CRC))
+            cover = _PembacaBerhash(f_cover, h_cover, posisi)
+            pesan = _PembacaBerhash(f_pesan, h_pesan, mulai_pesan)
+            f_output = open(file_stego, 'r+b')
+            f_output.truncate(posisi)
+            f_output.seek(posisi)
+        else:
+            job = _job(ukuran_cover, panjang_pesan, isEncrypt, isRandom, m, key, tipe, flags, header['nonce'])
+            cover, pesan, crc = _PembacaBerhash(f_cover), _PembacaBerhash(f_pesan), 0
+            f_output = open(file_stego, 'wb')
+
+        with f_output:
+            pencatat = _PencatatTitikSimpan(path, job, f_output, cover, pesan, posisi, interval)
+            setelah_chunk = pencatat
+            if progres is not None:
+                progres.lanjut_dari(posisi)
+                setelah_chunk = lambda tertulis: (pencatat(tertulis), progres.ke(tertulis))
+            lanjutkan_stream(cover, ukuran_cover, pesan, panjang_pesan, f_output, rencana, posisi, crc,
+                             isEncrypt, key, tipe, ukuran_chunk, pipa, setelah_chunk)
+
+    if os.path.exists(path):
+        os.remove(path)
+    return posisi
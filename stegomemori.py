@@ -0,0 +1,97 @@
+import os
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# =============================================================
+# == PENCATATAN MEMORI PER TAHAP ==
+# =============================================================
+#
+# Tiap tahap (spool, sisipkan, ekstrak, metrik, ...) dibungkus dengan `tahap(...)`.
+# Selama pencatatan belum diaktifkan, `tahap` tidak melakukan apa pun sehingga jalur
+# normal tidak membayar biaya tracemalloc. Setelah `aktifkan()`, setiap tahap mencatat:
+#
+#   puncak     : puncak alokasi Python/NumPy selama tahap (tracemalloc), relatif ke awal tahap
+#   rss_awal   : resident set size proses saat tahap dimulai
+#   rss_akhir  : resident set size proses saat tahap selesai
+#   rss_puncak : puncak RSS proses sejak program mulai (getrusage)
+#
+# Tahap boleh bersarang; puncak tahap luar tetap mencakup puncak tahap di dalamnya.
+# Pekerja di proses lain (misal sisipkan-pecahan) tidak ikut tercatat.
+
+_laporan = None
+_tumpukan = []
+
+def aktifkan():
+    """Mulai mencatat memori untuk tahap-tahap berikutnya."""
+    global _laporan
+    _laporan = []
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def nonaktifkan():
+    global _laporan
+    _laporan = None
+    _tumpukan.clear()
+    tracemalloc.stop()
+
+def laporan():
+    """Daftar catatan tahap (dict) sejak aktifkan(), berurutan menurut selesainya tahap."""
+    return list(_laporan or [])
+
+def _rss():
+    """RSS proses saat ini dalam byte (Linux: /proc/self/statm), atau None jika tidak tersedia."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _rss_puncak():
+    # ru_maxrss dalam KiB di Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+@contextmanager
+def tahap(nama, ukuran_cover=None):
+    """Mencatat pemakaian memori blok kode sebagai satu tahap bernama."""
+    if _laporan is None:
+        yield
+        return
+
+    # Puncak yang sudah terlihat oleh tahap luar disimpan sebelum puncak tracemalloc di-reset
+    if _tumpukan:
+        _tumpukan[-1]['puncak_anak'] = max(_tumpukan[-1]['puncak_anak'], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+    bingkai = {'awal': tracemalloc.get_traced_memory()[0], 'puncak_anak': 0}
+    _tumpukan.append(bingkai)
+    rss_awal = _rss()
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        _tumpukan.pop()
+        puncak_absolut = max(tracemalloc.get_traced_memory()[1], bingkai['puncak_anak'])
+        if _tumpukan:
+            _tumpukan[-1]['puncak_anak'] = max(_tumpukan[-1]['puncak_anak'], puncak_absolut)
+        _laporan.append({
+            'tahap': nama,
+            'ukuran_cover': ukuran_cover,
+            'puncak': puncak_absolut - bingkai['awal'],
+            'rss_awal': rss_awal,
+            'rss_akhir': _rss(),
+            'rss_puncak': _rss_puncak(),
+            'durasi': time.perf_counter() - mulai,
+        })
+
+def _mib(n):
+    return "-" if n is None else f"{n / (1 << 20):.2f} MiB"
+
+def cetak_laporan(file=None):
+    """Mencetak tabel laporan memori per tahap."""
+    print(f"{'tahap':<14}{'puncak':>14}{'per byte':>10}{'RSS awal':>14}{'RSS akhir':>14}{'RSS puncak':>14}",
+          file=file)
+    for catatan in laporan():
+        per_byte = f"{catatan['puncak'] / catatan['ukuran_cover']:.3f}" if catatan['ukuran_cover'] else "-"
+        print(f"{catatan['tahap']:<14}{_mib(catatan['puncak']):>14}{per_byte:>10}{_mib(catatan['rss_awal']):>14}"
+              f"{_mib(catatan['rss_akhir']):>14}{_mib(catatan['rss_puncak']):>14}", file=file)
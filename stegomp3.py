@@ -2,6 +2,9 @@ import os
 import math
 import random
 import sys
+import numpy as np
+from stegokernel import sisip_lsb, baca_lsb
+from stegobits import DeretBit
 
 # =============================================================
 # == FUNGSI BANTU (HELPER FUNCTIONS) ==
@@ -35,14 +38,6 @@ def calculate_random_start_index(message_size_in_bits, m, cover_data_length, see
     print(f"Calculated random start index: {Irand}")
     return Irand
 
-def bytes_ke_biner(data_bytes):
-    """Mengubah data bytes menjadi string biner ('0101...')."""
-    return ''.join(format(byte, '08b') for byte in data_bytes)
-
-def biner_ke_bytes(biner_str):
-    """Mengubah string biner ('0101...') kembali menjadi data bytes."""
-    return bytes(int(biner_str[i:i+8], 2) for i in range(0, len(biner_str), 8))
-
 # =============================================================
 # == FUNGSI KRIPTOGRAFI (VIGENÈRE CIPHER FOR BYTES) ==
 # =============================================================
@@ -76,19 +71,11 @@ def sisipkan_file(cover_data, message_data, isEncrypt, isRandom, m, key, tipe):
     if isEncrypt:
         message_data = encrypt(message_data, key)
 
-    message_biner = bytes_ke_biner(message_data)
-    panjang_pesan_biner = len(message_biner)
-
+    panjang_pesan_biner = len(message_data) * 8
     tipe_bytes = tipe.encode('utf-8').ljust(HEADER_TYPE_BYTES, b'\0')
-    header_type = bytes_ke_biner(tipe_bytes)
-    
-    header_Encrypt = format(isEncrypt, '01b')
-    header_random = format(isRandom, '01b')
-    header_m = format(m, '02b')
-    header_panjang = format(panjang_pesan_biner, '032b')
-    
-    data_untuk_disisipkan = header_type + header_Encrypt + message_biner
-    data_sisip_spesial = header_random + header_m + header_panjang
+
+    data_untuk_disisipkan = DeretBit(tipe_bytes).tambah(isEncrypt, 1).tambah_bytes(message_data)
+    data_sisip_spesial = DeretBit().tambah(isRandom, 1).tambah(m, 2).tambah(panjang_pesan_biner, 32)
 
     bytes_needed_for_special = len(data_sisip_spesial)
     bytes_needed_for_main = math.ceil(len(data_untuk_disisipkan) / m)
@@ -97,30 +84,18 @@ def sisipkan_file(cover_data, message_data, isEncrypt, isRandom, m, key, tipe):
         print("❌ Error: Kapasitas file cover tidak mencukupi.")
         return None
 
-    listed_data = [list(format(byte, '08b')) for byte in cover_data]
-    
-    idx_bit_spesial = 0
-    for i in range(bytes_needed_for_special):
-        listed_data[i][7] = data_sisip_spesial[idx_bit_spesial]
-        idx_bit_spesial += 1
+    stego_array = np.frombuffer(bytes(cover_data), dtype=np.uint8).copy()
+    sisip_lsb(stego_array[:bytes_needed_for_special], data_sisip_spesial.ke_bit(), 1)
 
-    idx_bit_pesan = 0
     start_byte_index = bytes_needed_for_special
     if isRandom:
         start_byte_index = calculate_random_start_index(len(data_untuk_disisipkan), m, len(cover_data), key_to_seed(key))
         if start_byte_index is None:
             return None
 
-    idx_byte_cover = start_byte_index
-    
-    while idx_bit_pesan < len(data_untuk_disisipkan) and idx_byte_cover < len(listed_data):
-        for j in range(8 - m, 8):
-            if idx_bit_pesan < len(data_untuk_disisipkan):
-                listed_data[idx_byte_cover][j] = data_untuk_disisipkan[idx_bit_pesan]
-                idx_bit_pesan += 1
-        idx_byte_cover += 1
-
-    stego_data = biner_ke_bytes("".join("".join(bits) for bits in listed_data))
+    sisip_lsb(stego_array[start_byte_index:], data_untuk_disisipkan.ke_bit(), m)
+
+    stego_data = stego_array.tobytes()
     return stego_data
 
 
@@ -129,14 +104,12 @@ def ekstrak_file(stego_data, key):
     try:
         # 1. Ekstrak header spesial dari 35 byte pertama (selalu 1 LSB)
         stego_bytes = bytes(stego_data)
-        header_spesial_biner = ""
-        for i in range(35):
-            header_spesial_biner += format(stego_bytes[i], '08b')[7]
+        header_spesial = DeretBit.dari_bit(baca_lsb(np.frombuffer(stego_bytes[:35], dtype=np.uint8), 1))
 
         # 2. Parse header spesial untuk mendapatkan parameter
-        isRandom = bool(int(header_spesial_biner[0]))
-        m = int(header_spesial_biner[1:3], 2)
-        panjang_pesan_biner = int(header_spesial_biner[3:35], 2)
+        isRandom = bool(header_spesial[0])
+        m = header_spesial.ambil(1, 2)
+        panjang_pesan_biner = header_spesial.ambil(3, 32)
 
         print(f"--- Extraction Info ---")
         print(f"Random Start: {isRandom}, LSB Count (m): {m}, Message Bits: {panjang_pesan_biner}")
@@ -151,31 +124,23 @@ def ekstrak_file(stego_data, key):
                 raise ValueError("Tidak dapat menghitung indeks awal. Kunci mungkin salah.")
 
         # 4. Ekstrak payload utama dari lokasi yang benar
-        extracted_bits = ""
-        idx_byte_cover = start_byte_index
         bits_to_extract = total_bit_payload
+        byte_payload = stego_bytes[start_byte_index:start_byte_index + math.ceil(bits_to_extract / m)]
+        extracted_bits = DeretBit.dari_bit(baca_lsb(np.frombuffer(byte_payload, dtype=np.uint8), m))
 
-        while len(extracted_bits) < bits_to_extract and idx_byte_cover < len(stego_data):
-            byte_biner = format(stego_bytes[idx_byte_cover], '08b')
-            extracted_bits += byte_biner[8 - m:]
-            idx_byte_cover += 1
-        
         # Potong jika ada kelebihan bit akibat ekstraksi per byte
         extracted_bits = extracted_bits[:bits_to_extract]
 
         # 5. Parse payload utama
         header_type_len = HEADER_TYPE_BYTES * 8
-        header_type_biner = extracted_bits[0:header_type_len]
-        isEncrypt = bool(int(extracted_bits[header_type_len]))
-        
-        pesan_biner = extracted_bits[header_type_len + 1:]
+        isEncrypt = bool(extracted_bits[header_type_len])
 
         # 6. Konversi header tipe file dan pesan
-        tipe_bytes = biner_ke_bytes(header_type_biner)
+        tipe_bytes = bytes(extracted_bits[:header_type_len])
         # Hapus padding byte null di akhir
         tipe_file = tipe_bytes.replace(b'\0', b'').decode('utf-8')
         
-        message_data = biner_ke_bytes(pesan_biner)
+        message_data = bytes(extracted_bits[header_type_len + 1:])
 
         # 7. Dekripsi jika perlu
         if isEncrypt:
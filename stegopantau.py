@@ -0,0 +1,301 @@
+import fcntl
+import os
+import re
+import threading
+import time
+from stegoprogres import Dibatalkan
+
+# =============================================================
+# == METRIK OPERASI (FORMAT TEKS PROMETHEUS) ==
+# =============================================================
+#
+# Selama belum diaktifkan, `operasi(...)` mengembalikan objek kosong yang sama setiap kali,
+# sehingga jalur normal hanya membayar satu pemanggilan fungsi per operasi (bukan per chunk).
+# Setelah `aktifkan()`, setiap operasi mencatat:
+#
+#   stego_operasi_total{operasi, m, hasil}  : jumlah operasi, hasil "sukses" atau "gagal"
+#   stego_gagal_total{operasi, m, alasan}   : kegagalan menurut alasan (lihat alasan_galat)
+#   stego_byte_total{operasi, m, jenis}     : byte cover dan pesan yang diproses
+#   stego_durasi_detik{operasi, m}          : histogram latensi per operasi
+#
+# Hasilnya diekspor sebagai teks Prometheus ke file untuk textfile collector node_exporter
+# (`tulis_textfile`, nilai dijumlahkan dengan isi file yang sudah ada sehingga counter tetap
+# naik di antara proses CLI) atau dilayani lewat HTTP di /metrics (`layani_http`).
+
+BATAS_HISTOGRAM = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_KETERANGAN = {
+    'stego_operasi_total': ('counter', "Jumlah operasi menurut hasilnya."),
+    'stego_gagal_total': ('counter', "Jumlah operasi gagal menurut alasannya."),
+    'stego_byte_total': ('counter', "Byte cover dan pesan yang diproses."),
+    'stego_durasi_detik': ('histogram', "Latensi operasi dalam detik."),
+}
+
+# Alasan kegagalan dari pesan ValueError; urutan menentukan prioritas
+_POLA_ALASAN = (
+    ('kapasitas', ('Kapasitas', 'terlalu besar')),
+    ('kunci_salah', ('Kunci mungkin salah', 'Kunci berbeda')),
+    ('file_rusak', ('terpotong', 'terlalu pendek', 'tidak cocok', 'rusak')),
+)
+
+def alasan_galat(e):
+    """Label alasan kegagalan untuk exception `e`."""
+    if isinstance(e, Dibatalkan):
+        return 'dibatalkan'
+    if isinstance(e, UnicodeDecodeError):
+        # Field tipe yang tidak bisa didekode hampir selalu berarti posisi acak/keystream dari kunci lain
+        return 'kunci_salah'
+    if isinstance(e, ValueError):
+        pesan = str(e)
+        for alasan, pola in _POLA_ALASAN:
+            if any(p in pesan for p in pola):
+                return alasan
+        return 'parse'
+    if isinstance(e, IndexError):
+        return 'parse'
+    if isinstance(e, OSError):
+        return 'io'
+    return 'lainnya'
+
+def _teks_label(label):
+    return ','.join(f'{k}="{v}"' for k, v in label)
+
+class Registri:
+    """Counter dan histogram bernama dengan label, aman dipakai dari beberapa thread."""
+
+    def __init__(self, batas_histogram=BATAS_HISTOGRAM):
+        self.batas_histogram = batas_histogram
+        self._kunci = threading.Lock()
+        self._counter = {}   # (nama, label) -> nilai
+        self._histogram = {} # (nama, label) -> [jumlah per batas..., +Inf, total nilai]
+
+    def tambah(self, nama, nilai=1, **label):
+        kunci = (nama, tuple(sorted(label.items())))
+        with self._kunci:
+            self._counter[kunci] = self._counter.get(kunci, 0) + nilai
+
+    def amati(self, nama, nilai, **label):
+        kunci = (nama, tuple(sorted(label.items())))
+        with self._kunci:
+            isi = self._histogram.get(kunci)
+            if isi is None:
+                isi = self._histogram[kunci] = [0] * (len(self.batas_histogram) + 2)
+            for i, batas in enumerate(self.batas_histogram):
+                if nilai <= batas:
+                    isi[i] += 1
+            isi[-2] += 1
+            isi[-1] += nilai
+
+    def sampel(self):
+        """Semua sampel sebagai dict {(nama, teks label): nilai}, dengan bucket histogram kumulatif."""
+        hasil = {}
+        with self._kunci:
+            for (nama, label), nilai in self._counter.items():
+                hasil[(nama, _teks_label(label))] = nilai
+            for (nama, label), isi in self._histogram.items():
+                for batas, jumlah in zip(self.batas_histogram + ('+Inf',), isi[:-1]):
+                    hasil[(nama + '_bucket', _teks_label(label + (('le', batas),)))] = jumlah
+                hasil[(nama + '_count', _teks_label(label))] = isi[-2]
+                hasil[(nama + '_sum', _teks_label(label))] = isi[-1]
+        return hasil
+
+def _nama_dasar(nama):
+    for akhiran in ('_bucket', '_count', '_sum'):
+        if nama.endswith(akhiran) and nama[:-len(akhiran)] in _KETERANGAN:
+            return nama[:-len(akhiran)]
+    return nama
+
+_POLA_LE = re.compile(r',?le="([^"]*)"')
+
+def _urutan(kunci):
+    """Kunci pengurutan: per metrik dan label, bucket histogram menurut batas (le) numerik."""
+    nama, label = kunci
+    le = _POLA_LE.search(label)
+    akhiran = {'_bucket': 0, '_sum': 1, '_count': 2}.get(nama[len(_nama_dasar(nama)):], 0)
+    return (_nama_dasar(nama), _POLA_LE.sub('', label), akhiran, float(le.group(1)) if le else 0.0)
+
+def format_teks(sampel):
+    """Sampel {(nama, teks label): nilai} dalam format teks Prometheus, dikelompokkan per metrik."""
+    baris = []
+    ditulis = set()
+    for nama, label in sorted(sampel, key=_urutan):
+        dasar = _nama_dasar(nama)
+        if dasar not in ditulis and dasar in _KETERANGAN:
+            jenis, keterangan = _KETERANGAN[dasar]
+            baris.append(f"# HELP {dasar} {keterangan}")
+            baris.append(f"# TYPE {dasar} {jenis}")
+            ditulis.add(dasar)
+        nilai = sampel[(nama, label)]
+        teks_nilai = repr(float(nilai)) if isinstance(nilai, float) else str(nilai)
+        baris.append(f"{nama}{{{label}}} {teks_nilai}" if label else f"{nama} {teks_nilai}")
+    return '\n'.join(baris) + '\n'
+
+def _baca_teks(teks):
+    """Kebalikan format_teks untuk file yang ditulis modul ini (baris komentar diabaikan)."""
+    sampel = {}
+    for baris in teks.splitlines():
+        if not baris or baris.startswith('#'):
+            continue
+        kiri, _, nilai = baris.rpartition(' ')
+        nama, _, label = kiri.partition('{')
+        # format_teks menulis counter bulat tanpa titik desimal
+        sampel[(nama, label.rstrip('}'))] = int(nilai) if nilai.lstrip('-').isdigit() else float(nilai)
+    return sampel
+
+# =============================================================
+# == PENCATATAN PER OPERASI ==
+# =============================================================
+
+_registri = None
+# Operasi yang sedang berjalan per thread; gagal/byte/label berlaku untuk yang paling dalam
+_lokal = threading.local()
+
+def aktifkan(registri=None):
+    """Mulai mencatat metrik ke `registri` (baru jika tidak diberikan). Mengembalikan registrinya."""
+    global _registri
+    _registri = registri if registri is not None else Registri()
+    return _registri
+
+def nonaktifkan():
+    global _registri
+    _registri = None
+
+def registri():
+    return _registri
+
+class _TanpaCatatan:
+    """Pengganti _Catatan selama pencatatan tidak aktif: semua metode tidak melakukan apa pun."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *galat):
+        return False
+
+    def label(self, **label):
+        pass
+
+    def byte(self, jenis, n):
+        pass
+
+    def gagal(self, alasan):
+        pass
+
+_TANPA_CATATAN = _TanpaCatatan()
+
+class _Catatan:
+    """Satu operasi yang sedang berjalan; dicatat ke registri saat blok `with` selesai."""
+
+    def __init__(self, registri, operasi, m):
+        self._registri = registri
+        self._label = {'operasi': operasi, 'm': '' if m is None else str(m)}
+        self._byte = {}
+        self._alasan = None
+
+    def __enter__(self):
+        if not hasattr(_lokal, 'tumpukan'):
+            _lokal.tumpukan = []
+        _lokal.tumpukan.append(self)
+        self._mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, jenis, galat, jejak):
+        durasi = time.perf_counter() - self._mulai
+        _lokal.tumpukan.pop()
+        if galat is not None and self._alasan is None:
+            self._alasan = alasan_galat(galat)
+        hasil = 'sukses' if self._alasan is None else 'gagal'
+        self._registri.tambah('stego_operasi_total', hasil=hasil, **self._label)
+        if self._alasan is not None:
+            self._registri.tambah('stego_gagal_total', alasan=self._alasan, **self._label)
+        for jenis_byte, n in self._byte.items():
+            self._registri.tambah('stego_byte_total', n, jenis=jenis_byte, **self._label)
+        self._registri.amati('stego_durasi_detik', durasi, **self._label)
+        return False
+
+    def label(self, **label):
+        self._label.update((k, '' if v is None else str(v)) for k, v in label.items())
+
+    def byte(self, jenis, n):
+        self._byte[jenis] = self._byte.get(jenis, 0) + n
+
+    def gagal(self, alasan):
+        self._alasan = alasan if isinstance(alasan, str) else alasan_galat(alasan)
+
+def operasi(nama, m=None):
+    """Context manager pencatat satu operasi bernama; tidak melakukan apa pun jika belum diaktifkan."""
+    if _registri is None:
+        return _TANPA_CATATAN
+    return _Catatan(_registri, nama, m)
+
+def _aktif():
+    tumpukan = getattr(_lokal, 'tumpukan', None)
+    return tumpukan[-1] if tumpukan else _TANPA_CATATAN
+
+def label(**label):
+    """Mengisi label yang baru diketahui di tengah operasi (misal m dari header saat ekstraksi)."""
+    _aktif().label(**label)
+
+def byte(jenis, n):
+    """Menambahkan `n` byte berjenis `jenis` ('cover' atau 'pesan') yang diproses operasi aktif."""
+    _aktif().byte(jenis, n)
+
+def gagal(alasan):
+    """Menandai operasi aktif gagal; `alasan` berupa label atau exception (lihat alasan_galat)."""
+    _aktif().gagal(alasan)
+
+# =============================================================
+# == EKSPOR ==
+# =============================================================
+
+def tulis_textfile(path, registri=None):
+    """
+    Menjumlahkan metrik registri ke file teks Prometheus `path` (misal untuk textfile collector
+    node_exporter). File diganti secara atomik dan dikunci selama dibaca-tulis, sehingga
+    beberapa proses boleh menulis ke file yang sama.
+    """
+    registri = registri if registri is not None else _registri
+    with open(path + '.lock', 'w') as f_kunci:
+        fcntl.flock(f_kunci, fcntl.LOCK_EX)
+        sampel = {}
+        try:
+            with open(path) as f:
+                sampel = _baca_teks(f.read())
+        except (OSError, ValueError):
+            pass # file belum ada atau bukan tulisan modul ini: mulai dari nol
+        for kunci, nilai in registri.sampel().items():
+            sampel[kunci] = sampel.get(kunci, 0) + nilai
+
+        sementara = f"{path}.{os.getpid()}.tmp"
+        with open(sementara, 'w') as f:
+            f.write(format_teks(sampel))
+        os.replace(sementara, path)
+
+def layani_http(port, alamat='127.0.0.1', registri=None):
+    """
+    Melayani metrik registri di http://alamat:port/metrics dari thread latar.
+    Mengembalikan server; panggil server.shutdown() untuk berhenti.
+    """
+    # http.server baru dimuat di sini agar startup CLI tidak ikut membayarnya
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registri = registri if registri is not None else _registri
+
+    class _Penangan(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            isi = format_teks(registri.sampel()).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(isi)))
+            self.end_headers()
+            self.wfile.write(isi)
+
+        def log_message(self, *args):
+            pass # permintaan scrape tidak dicetak ke stderr
+
+    server = ThreadingHTTPServer((alamat, port), _Penangan)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,130 @@
+import queue
+import threading
+import numpy as np
+
+# =============================================================
+# == PIPA BACA / PROSES / TULIS ==
+# =============================================================
+#
+# Pada mode berurutan, setiap chunk dibaca, diproses, lalu ditulis sebelum chunk berikutnya
+# dibaca, sehingga disk menganggur selama CPU bekerja dan sebaliknya. Mode pipa memisahkan
+# ketiganya: thread pembaca mengisi buffer-buffer yang dipakai ulang, thread utama memprosesnya,
+# dan thread penulis menulis hasilnya. Antrian di antara tahap dibatasi oleh jumlah buffer,
+# sehingga memori tetap JUMLAH_BUFFER x ukuran chunk dan waktu total mendekati tahap terlambat.
+
+# Satu buffer sedang dibaca, satu diproses, satu ditulis; sisanya cadangan agar tahap
+# yang sesaat lebih cepat tidak langsung menunggu.
+JUMLAH_BUFFER = 4
+
+_SELESAI = object()
+
+def _isi_buffer(f, buffer):
+    """Mengisi `buffer` (array uint8) dari f sampai penuh atau EOF. Mengembalikan jumlah byte terbaca."""
+    if not hasattr(f, 'readinto'):
+        data = f.read(len(buffer))
+        buffer[:len(data)] = np.frombuffer(data, dtype=np.uint8)
+        return len(data)
+
+    tampilan = memoryview(buffer)
+    terisi = 0
+    # readinto pada pipe boleh mengembalikan lebih sedikit dari yang diminta
+    while terisi < len(buffer):
+        n = f.readinto(tampilan[terisi:])
+        if not n:
+            break
+        terisi += n
+    return terisi
+
+class PembacaLatar:
+    """
+    Membaca `jumlah_byte` byte dari posisi f saat ini per chunk di thread latar.
+    Iterasi menghasilkan array uint8 (view ke buffer yang dipakai ulang); setiap array
+    harus dikembalikan dengan `kembalikan` setelah selesai dipakai.
+    """
+
+    def __init__(self, f, jumlah_byte, ukuran_chunk, jumlah_buffer=JUMLAH_BUFFER):
+        self._bebas = queue.Queue()
+        for _ in range(jumlah_buffer):
+            self._bebas.put(np.empty(ukuran_chunk, dtype=np.uint8))
+        self._siap = queue.Queue()
+        self._berhenti = threading.Event()
+        self._thread = threading.Thread(target=self._kerja, args=(f, jumlah_byte), daemon=True)
+        self._thread.start()
+
+    def _kerja(self, f, jumlah_byte):
+        try:
+            while jumlah_byte > 0:
+                buffer = self._bebas.get()
+                if self._berhenti.is_set():
+                    return
+                n = _isi_buffer(f, buffer[:jumlah_byte])
+                if n == 0:
+                    break
+                self._siap.put(buffer[:n])
+                jumlah_byte -= n
+            self._siap.put(_SELESAI)
+        except BaseException as e:
+            self._siap.put(e)
+
+    def __iter__(self):
+        while True:
+            item = self._siap.get()
+            if item is _SELESAI:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def kembalikan(self, chunk):
+        self._bebas.put(chunk.base if chunk.base is not None else chunk)
+
+    def tutup(self):
+        """Menghentikan thread pembaca (juga jika iterasi berhenti di tengah jalan)."""
+        self._berhenti.set()
+        self._bebas.put(None)
+        self._thread.join()
+
+class PenulisLatar:
+    """Menulis chunk ke f di thread latar, dengan antrian terbatas `kedalaman` chunk."""
+
+    def __init__(self, f, kedalaman=JUMLAH_BUFFER):
+        self._antrian = queue.Queue(maxsize=kedalaman)
+        self._galat = None
+        self.tertulis = 0 # jumlah byte yang sudah berhasil ditulis ke f
+        self._thread = threading.Thread(target=self._kerja, args=(f,), daemon=True)
+        self._thread.start()
+
+    def _kerja(self, f):
+        while True:
+            item = self._antrian.get()
+            if item is _SELESAI:
+                return
+            data, setelah_tulis = item
+            # Setelah gagal, antrian tetap dikuras agar thread utama tidak tertahan
+            if self._galat is None:
+                try:
+                    # memoryview agar file-like sederhana (misal TampilanFrame) menerima array NumPy seperti bytes
+                    f.write(memoryview(data))
+                    self.tertulis += len(data)
+                except BaseException as e:
+                    self._galat = e
+            if setelah_tulis is not None:
+                setelah_tulis(data)
+
+    def tulis(self, data, setelah_tulis=None):
+        """Mengantrikan `data`; `setelah_tulis(data)` dipanggil setelah data selesai ditulis."""
+        if self._galat is not None:
+            raise self._galat
+        self._antrian.put((data, setelah_tulis))
+
+    def tutup(self):
+        """Menunggu chunk yang sudah diantrikan tertulis dan menghentikan thread penulis."""
+        if self._thread.is_alive():
+            self._antrian.put(_SELESAI)
+            self._thread.join()
+
+    def selesai(self):
+        """Seperti `tutup`, lalu meneruskan galat penulisan jika ada."""
+        self.tutup()
+        if self._galat is not None:
+            raise self._galat
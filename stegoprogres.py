@@ -0,0 +1,108 @@
+import sys
+import threading
+import time
+
+# =============================================================
+# == PROGRES DAN PEMBATALAN ==
+# =============================================================
+#
+# Operasi panjang (sisipkan, ekstrak, metrik) memproses data per chunk. Di antara chunk,
+# Progres memeriksa TokenBatal dan memanggil callback(selesai, total, laju, eta):
+#
+#   selesai : jumlah unit (byte atau sampel) yang sudah diproses
+#   total   : jumlah unit seluruhnya, atau None jika tidak diketahui
+#   laju    : unit per detik sejak operasi dimulai
+#   eta     : perkiraan detik tersisa, atau None jika total/laju belum diketahui
+#
+# Pembatalan bersifat kooperatif: token hanya diperiksa di antara chunk, lalu Dibatalkan
+# dilempar dari thread yang memproses. Token boleh dibatalkan dari thread mana pun.
+
+# Callback dipanggil paling sering sekali per interval ini (detik), ditambah sekali saat selesai
+INTERVAL_PROGRES = 0.1
+
+class Dibatalkan(Exception):
+    """Operasi dihentikan karena TokenBatal-nya dibatalkan."""
+
+class TokenBatal:
+    """Penanda pembatalan yang dibagikan antara pemanggil dan operasi yang berjalan."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def batalkan(self):
+        self._event.set()
+
+    @property
+    def dibatalkan(self):
+        return self._event.is_set()
+
+    def periksa(self):
+        if self._event.is_set():
+            raise Dibatalkan("Operasi dibatalkan.")
+
+class Progres:
+    """Melacak kemajuan satu operasi dan meneruskannya ke callback, sambil memeriksa token."""
+
+    def __init__(self, total, callback=None, token=None, interval=INTERVAL_PROGRES):
+        self.total = total
+        self.callback = callback
+        self.token = token
+        self.interval = interval
+        self.selesai = 0
+        self._awal = 0
+        self._mulai = time.perf_counter()
+        self._terakhir = None
+
+    def lanjut_dari(self, selesai):
+        """Operasi dilanjutkan dari unit ke-`selesai`; laju dan ETA hanya menghitung unit sesudahnya."""
+        self.selesai = self._awal = selesai
+        self._mulai = time.perf_counter()
+
+    def maju(self, n):
+        """Menambah `n` unit yang sudah diproses."""
+        self.ke(self.selesai + n)
+
+    def ke(self, selesai):
+        """Mencatat bahwa `selesai` unit sudah diproses. Melempar Dibatalkan jika token dibatalkan."""
+        self.selesai = selesai
+        if self.token is not None:
+            self.token.periksa()
+        if self.callback is None:
+            return
+        sekarang = time.perf_counter()
+        tuntas = self.total is not None and selesai >= self.total
+        if not tuntas and self._terakhir is not None and sekarang - self._terakhir < self.interval:
+            return
+        self._terakhir = sekarang
+        durasi = sekarang - self._mulai
+        laju = (selesai - self._awal) / durasi if durasi > 0 else 0.0
+        eta = (self.total - selesai) / laju if self.total is not None and laju > 0 else None
+        self.callback(selesai, self.total, laju, eta)
+
+def buat_progres(total, callback=None, token=None):
+    """Progres untuk operasi berukuran `total`, atau None jika tidak ada callback maupun token."""
+    if callback is None and token is None:
+        return None
+    return Progres(total, callback, token)
+
+def _ukuran(n):
+    for satuan in ('B', 'KiB', 'MiB', 'GiB'):
+        if n < 1024 or satuan == 'GiB':
+            return f"{n:.1f} {satuan}" if satuan != 'B' else f"{n:.0f} B"
+        n /= 1024
+
+def bilah_progres(file=None, lebar=30, satuan='B'):
+    """Callback progres yang menggambar bilah teks di satu baris (default stderr)."""
+    def tampilkan(selesai, total, laju, eta):
+        f = file if file is not None else sys.stderr
+        teks_jumlah = _ukuran if satuan == 'B' else (lambda n: f"{n:.0f} {satuan}")
+        if total:
+            isi = min(lebar, int(lebar * selesai / total))
+            bilah = f"[{'#' * isi}{'.' * (lebar - isi)}] {100 * selesai / total:5.1f}%"
+        else:
+            bilah = teks_jumlah(selesai)
+        sisa = f" ETA {int(eta) // 60:d}:{int(eta) % 60:02d}" if eta is not None else ""
+        print(f"\r{bilah} {teks_jumlah(laju)}/s{sisa}  ", end='', file=f, flush=True)
+        if total is not None and selesai >= total:
+            print(file=f)
+    return tampilkan
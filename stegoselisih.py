@@ -0,0 +1,114 @@
+import os
+import numpy as np
+
+# =============================================================
+# == SELISIH BIT COVER VS STEGO ==
+# =============================================================
+#
+# Pengganti prototipe bacaBinary.py / ubahLSBBerurutan.py / manipulasiByteTertentu.py yang
+# mencetak format(byte, '08b') untuk beberapa byte: kedua file di-memory-map, lalu XOR
+# dihitung per chunk dengan NumPy di seluruh file. Bit berubah per bidang bit dihitung
+# langsung dari byte XOR dengan masker, sehingga tidak ada array bit sebesar file.
+
+# Byte per chunk XOR; memori puncak sekitar 10x ini jika hampir semua byte chunk berubah
+UKURAN_CHUNK_SELISIH = 8 << 20
+
+def bandingkan(path_a, path_b, celah=16, batas_rentang=20, ukuran_chunk=UKURAN_CHUNK_SELISIH, progres=None):
+    """
+    Membandingkan dua file byte demi byte sepanjang file yang lebih pendek.
+    Byte berubah yang dipisahkan paling banyak `celah` byte tak berubah digabung menjadi satu rentang;
+    hanya `batas_rentang` rentang pertama yang disimpan, tetapi semuanya dihitung.
+    `progres` (stegoprogres.Progres, total = byte yang dibandingkan) dimajukan setiap chunk.
+
+    Returns:
+        dict: ukuran_a, ukuran_b, dibandingkan, byte_berubah, bit_berubah (daftar 8, indeks 0 = LSB),
+              jumlah_rentang, dan rentang (daftar (awal, akhir)).
+    """
+    ukuran_a, ukuran_b = os.path.getsize(path_a), os.path.getsize(path_b)
+    n = min(ukuran_a, ukuran_b)
+    byte_berubah = 0
+    bit_berubah = [0] * 8
+    rentang = []
+    jumlah_rentang = 0
+    terbuka = None # rentang terakhir, mungkin masih bersambung ke chunk berikutnya
+
+    if n:
+        a = np.memmap(path_a, dtype=np.uint8, mode='r', shape=(n,))
+        b = np.memmap(path_b, dtype=np.uint8, mode='r', shape=(n,))
+        xor = np.empty(min(ukuran_chunk, n), dtype=np.uint8)
+        sementara = np.empty_like(xor)
+        for posisi in range(0, n, ukuran_chunk):
+            akhir = min(n, posisi + ukuran_chunk)
+            x = np.bitwise_xor(a[posisi:akhir], b[posisi:akhir], out=xor[:akhir - posisi])
+            if progres is not None:
+                progres.ke(akhir)
+            if not x.any():
+                continue
+
+            byte_berubah += np.count_nonzero(x)
+            for k in range(8):
+                bit_berubah[k] += np.count_nonzero(np.bitwise_and(x, 1 << k, out=sementara[:len(x)]))
+
+            indeks = np.flatnonzero(x) + posisi
+            putus = np.flatnonzero(np.diff(indeks) > celah + 1) + 1
+            awal_r = np.concatenate(([indeks[0]], indeks[putus]))
+            akhir_r = np.concatenate((indeks[putus - 1], [indeks[-1]])) + 1
+
+            if terbuka is not None and awal_r[0] - terbuka[1] <= celah:
+                awal_r[0] = terbuka[0]
+            elif terbuka is not None:
+                jumlah_rentang += 1
+                if len(rentang) < batas_rentang:
+                    rentang.append(terbuka)
+            jumlah_rentang += len(awal_r) - 1
+            for r in zip(awal_r[:-1][:batas_rentang - len(rentang)], akhir_r[:-1]):
+                rentang.append((int(r[0]), int(r[1])))
+            terbuka = (int(awal_r[-1]), int(akhir_r[-1]))
+
+    if terbuka is not None:
+        jumlah_rentang += 1
+        if len(rentang) < batas_rentang:
+            rentang.append(terbuka)
+
+    return {
+        'ukuran_a': ukuran_a,
+        'ukuran_b': ukuran_b,
+        'dibandingkan': n,
+        'byte_berubah': byte_berubah,
+        'bit_berubah': bit_berubah,
+        'jumlah_rentang': jumlah_rentang,
+        'rentang': rentang,
+    }
+
+# =============================================================
+# == DUMP BINER / HEKSA ==
+# =============================================================
+
+def baris_dump(path_a, path_b, offset, panjang, biner=False):
+    """
+    Baris-baris dump byte [offset, offset + panjang) kedua file berdampingan, diikuti XOR-nya
+    ('.' untuk byte/bit yang sama). Heksa 8 byte per baris, biner 4 byte per baris.
+    """
+    per_baris = 4 if biner else 8
+    with open(path_a, 'rb') as f_a, open(path_b, 'rb') as f_b:
+        f_a.seek(offset)
+        f_b.seek(offset)
+        data_a, data_b = f_a.read(panjang), f_b.read(panjang)
+
+    def sel(nilai, xor=False):
+        if nilai is None:
+            return ' ' * (8 if biner else 2)
+        teks = format(nilai, '08b') if biner else format(nilai, '02x')
+        if xor:
+            teks = teks.replace('0', '.') if biner else ('..' if nilai == 0 else teks)
+        return teks
+
+    lebar_kolom = per_baris * (9 if biner else 3) - 1
+    yield f"{'offset':<10}  {'A':<{lebar_kolom}}  {'B':<{lebar_kolom}}  XOR"
+    for awal in range(0, max(len(data_a), len(data_b)), per_baris):
+        nilai_a = [data_a[i] if i < len(data_a) else None for i in range(awal, awal + per_baris)]
+        nilai_b = [data_b[i] if i < len(data_b) else None for i in range(awal, awal + per_baris)]
+        nilai_x = [x ^ y if x is not None and y is not None else None for x, y in zip(nilai_a, nilai_b)]
+        kolom = [' '.join(sel(v) for v in nilai_a), ' '.join(sel(v) for v in nilai_b),
+                 ' '.join(sel(v, True) for v in nilai_x)]
+        yield f"{offset + awal:#010x}  {kolom[0]:<{lebar_kolom}}  {kolom[1]:<{lebar_kolom}}  {kolom[2]}".rstrip()
@@ -0,0 +1,207 @@
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from stegostream import (FLAG_PECAHAN, FLAG_CRC, kapasitas_pesan, sisipkan_stream, baca_info_stego, baca_pesan,
+                         baca_crc)
+
+# =============================================================
+# == FORMAT PECAHAN (SHARD) ==
+# =============================================================
+#
+# Pesan yang terlalu besar untuk satu cover dipecah ke beberapa cover. Setiap cover
+# membawa satu pecahan yang diawali header pecahan (ikut terenkripsi bersama datanya):
+#
+#   id_pesan (8 byte) + indeks (u16) + jumlah (u16) + ukuran_total (u64) + offset (u64)
+#
+# Karena setiap pecahan mendeskripsikan dirinya sendiri, urutan file stego saat
+# ekstraksi bebas dan setiap pecahan dapat diekstrak secara paralel.
+
+FORMAT_HEADER_PECAHAN = '<8sHHQQ'
+UKURAN_HEADER_PECAHAN = struct.calcsize(FORMAT_HEADER_PECAHAN)
+
+class _StreamPecahan:
+    """Stream baca berisi header pecahan lalu potongan [offset, offset + panjang) dari file pesan."""
+
+    def __init__(self, header, f_pesan, offset, panjang):
+        self.header = header
+        self.f_pesan = f_pesan
+        self.sisa = panjang
+        f_pesan.seek(offset)
+
+    def read(self, n):
+        if self.header:
+            hasil, self.header = self.header[:n], self.header[n:]
+            return hasil
+        hasil = self.f_pesan.read(min(n, self.sisa))
+        self.sisa -= len(hasil)
+        return hasil
+
+def rencanakan_pecahan(ukuran_pesan, daftar_ukuran_cover, m, isRandom=False, flags=0):
+    """
+    Membagi pesan ke cover-cover sebanding dengan kapasitas masing-masing.
+    Mengembalikan daftar (offset, panjang) per cover; cover yang tidak dipakai mendapat panjang 0.
+    """
+    kapasitas = [max(0, kapasitas_pesan(ukuran, m, isRandom, FLAG_PECAHAN | flags) - UKURAN_HEADER_PECAHAN)
+                 for ukuran in daftar_ukuran_cover]
+    total_kapasitas = sum(kapasitas)
+    if ukuran_pesan > total_kapasitas:
+        raise ValueError(f"Kapasitas seluruh cover ({total_kapasitas} byte) tidak mencukupi "
+                         f"untuk pesan {ukuran_pesan} byte.")
+
+    # Bagian sebanding kapasitas (dibulatkan ke bawah), sisanya dibagikan ke cover yang masih muat
+    bagian = [ukuran_pesan * k // total_kapasitas if total_kapasitas else 0 for k in kapasitas]
+    sisa = ukuran_pesan - sum(bagian)
+    for i, k in enumerate(kapasitas):
+        tambahan = min(sisa, k - bagian[i])
+        bagian[i] += tambahan
+        sisa -= tambahan
+
+    rencana = []
+    offset = 0
+    for panjang in bagian:
+        rencana.append((offset, panjang))
+        offset += panjang
+    return rencana
+
+def _kerja_sisip(tugas):
+    """Dijalankan di proses pekerja: menyisipkan satu pecahan ke satu cover."""
+    header = struct.pack(FORMAT_HEADER_PECAHAN, tugas['id_pesan'], tugas['indeks'], tugas['jumlah'],
+                         tugas['ukuran_total'], tugas['offset'])
+    with open(tugas['file_cover'], "rb") as f_cover, open(tugas['file_pesan'], "rb") as f_pesan, \
+            open(tugas['file_stego'], "wb") as f_output:
+        f_sumber = _StreamPecahan(header, f_pesan, tugas['offset'], tugas['panjang'])
+        sisipkan_stream(f_cover, os.path.getsize(tugas['file_cover']), f_sumber,
+                        UKURAN_HEADER_PECAHAN + tugas['panjang'], f_output, tugas['isEncrypt'], tugas['isRandom'], tugas['m'], tugas['key'], tugas['tipe'],
+                        FLAG_PECAHAN | tugas['flags'])
+    return tugas['file_stego']
+
+def sisipkan_pecahan(file_pesan, daftar_cover, folder_output, isEncrypt, isRandom, m, key, tipe, jumlah_proses=None,
+                     flags=0):
+    """
+    Memecah file pesan ke beberapa cover dan menyisipkan setiap pecahan secara paralel.
+    File stego ditulis ke folder_output dengan nama yang sama dengan cover-nya.
+    Mengembalikan daftar file stego yang dihasilkan.
+    """
+    ukuran_pesan = os.path.getsize(file_pesan)
+    rencana = rencanakan_pecahan(ukuran_pesan, [os.path.getsize(path) for path in daftar_cover], m, isRandom, flags)
+    dipakai = [(cover, offset, panjang) for cover, (offset, panjang) in zip(daftar_cover, rencana) if panjang > 0]
+    if len(dipakai) > 0xFFFF:
+        raise ValueError("Jumlah pecahan terlalu banyak.")
+
+    os.makedirs(folder_output, exist_ok=True)
+    id_pesan = os.urandom(8)
+    daftar_tugas = [{
+        'file_cover': cover,
+        'file_pesan': file_pesan,
+        'file_stego': os.path.join(folder_output, os.path.basename(cover)),
+        'id_pesan': id_pesan,
+        'indeks': indeks,
+        'jumlah': len(dipakai),
+        'ukuran_total': ukuran_pesan,
+        'offset': offset,
+        'panjang': panjang,
+        'isEncrypt': isEncrypt,
+        'isRandom': isRandom,
+        'm': m,
+        'key': key,
+        'tipe': tipe,
+        'flags': flags,
+    } for indeks, (cover, offset, panjang) in enumerate(dipakai)]
+
+    if len({tugas['file_stego'] for tugas in daftar_tugas}) != len(daftar_tugas):
+        raise ValueError("Nama file cover tidak boleh kembar.")
+    # Output yang menunjuk ke salah satu input akan mengosongkan input itu saat dibuka "wb"
+    masukan = {os.path.realpath(path) for path in daftar_cover + [file_pesan]}
+    for tugas in daftar_tugas:
+        if os.path.realpath(tugas['file_stego']) in masukan:
+            raise ValueError(f"File output '{tugas['file_stego']}' sama dengan file input; "
+                             "pilih folder output lain.")
+
+    sudah_ada = {tugas['file_stego'] for tugas in daftar_tugas if os.path.lexists(tugas['file_stego'])}
+    try:
+        with ProcessPoolExecutor(max_workers=jumlah_proses) as eksekutor:
+            return list(eksekutor.map(_kerja_sisip, daftar_tugas))
+    except Exception:
+        # Pecahan yang sudah (setengah) tertulis tidak berguna tanpa pecahan lainnya; hanya file
+        # yang dibuat oleh panggilan ini yang dihapus
+        for tugas in daftar_tugas:
+            if tugas['file_stego'] not in sudah_ada and os.path.exists(tugas['file_stego']):
+                os.remove(tugas['file_stego'])
+        raise
+
+def _kerja_baca_header(tugas):
+    """Dijalankan di proses pekerja: membaca info stego dan header pecahan dari satu file."""
+    with open(tugas['file_stego'], "rb") as f_stego:
+        info = baca_info_stego(f_stego, os.path.getsize(tugas['file_stego']), tugas['key'])
+        if not info['flags'] & FLAG_PECAHAN:
+            raise ValueError(f"File '{tugas['file_stego']}' tidak berisi pecahan pesan")
+        header = b''.join(baca_pesan(f_stego, info, tugas['key'], 0, UKURAN_HEADER_PECAHAN))
+
+    id_pesan, indeks, jumlah, ukuran_total, offset = struct.unpack(FORMAT_HEADER_PECAHAN, header)
+    return {
+        'file_stego': tugas['file_stego'],
+        'info': info,
+        'id_pesan': id_pesan,
+        'indeks': indeks,
+        'jumlah': jumlah,
+        'ukuran_total': ukuran_total,
+        'offset': offset,
+        'panjang': info['panjang_pesan_biner'] // 8 - UKURAN_HEADER_PECAHAN,
+        'crc_header': zlib.crc32(header),
+    }
+
+def _kerja_ekstrak(tugas):
+    """
+    Dijalankan di proses pekerja: menulis data satu pecahan ke posisinya di file output.
+    Dengan FLAG_CRC, CRC32 header pecahan + data dicocokkan dengan trailer pecahan itu.
+    """
+    pecahan = tugas['pecahan']
+    info = pecahan['info']
+    crc = pecahan['crc_header']
+    with open(pecahan['file_stego'], "rb") as f_stego, open(tugas['file_output'], "r+b") as f_output:
+        f_output.seek(pecahan['offset'])
+        for chunk in baca_pesan(f_stego, info, tugas['key'], UKURAN_HEADER_PECAHAN, pecahan['panjang']):
+            f_output.write(chunk)
+            crc = zlib.crc32(chunk, crc)
+        if info['flags'] & FLAG_CRC and crc != baca_crc(f_stego, info):
+            raise ValueError(f"Checksum pecahan '{pecahan['file_stego']}' tidak cocok. "
+                             "Kunci mungkin salah atau file stego rusak.")
+    return pecahan['indeks']
+
+def ekstrak_pecahan(daftar_stego, key, output_basename, jumlah_proses=None):
+    """
+    Mengekstrak pecahan-pecahan dari beberapa file stego secara paralel dan menyusunnya
+    kembali menjadi '{output_basename}.{tipe_file}'. Mengembalikan nama file output.
+    """
+    if not daftar_stego:
+        raise ValueError("Tidak ada file stego yang diberikan")
+
+    with ProcessPoolExecutor(max_workers=jumlah_proses) as eksekutor:
+        daftar_pecahan = list(eksekutor.map(_kerja_baca_header,
+                                            [{'file_stego': path, 'key': key} for path in daftar_stego]))
+
+        # Validasi: semua pecahan berasal dari pesan yang sama dan lengkap
+        pertama = daftar_pecahan[0]
+        for pecahan in daftar_pecahan:
+            if (pecahan['id_pesan'], pecahan['jumlah'], pecahan['ukuran_total']) != \
+                    (pertama['id_pesan'], pertama['jumlah'], pertama['ukuran_total']):
+                raise ValueError(f"Pecahan '{pecahan['file_stego']}' berasal dari pesan yang berbeda")
+        indeks_ada = sorted(pecahan['indeks'] for pecahan in daftar_pecahan)
+        if indeks_ada != list(range(pertama['jumlah'])):
+            raise ValueError(f"Pecahan tidak lengkap: ditemukan {len(set(indeks_ada))} dari {pertama['jumlah']}")
+        if sum(pecahan['panjang'] for pecahan in daftar_pecahan) != pertama['ukuran_total']:
+            raise ValueError("Ukuran pecahan tidak sesuai dengan ukuran pesan")
+
+        tipe_file = pertama['info']['tipe_file']
+        output_filename = f"{output_basename}.{tipe_file}" if tipe_file else output_basename
+        with open(output_filename, "wb") as f_output:
+            f_output.truncate(pertama['ukuran_total'])
+
+        try:
+            list(eksekutor.map(_kerja_ekstrak, [{'pecahan': pecahan, 'key': key, 'file_output': output_filename}
+                                                for pecahan in daftar_pecahan]))
+        except Exception:
+            os.remove(output_filename)
+            raise
+    return output_filename
@@ -0,0 +1,778 @@
+import hashlib
+import io
+import math
+import os
+import random
+import shutil
+import tempfile
+import zlib
+from collections import OrderedDict
+import numpy as np
+from stegokernel import sisip_lsb, baca_lsb
+from stegopipa import PembacaLatar, PenulisLatar
+from stegobits import DeretBit
+
+# =============================================================
+# == KONSTANTA ==
+# =============================================================
+
+HEADER_TYPE_BYTES = 10 # 10 bytes = 80 bits
+HEADER_SPESIAL_BITS = 35 # random (1) + m (2) + panjang pesan (32), 1 LSB per byte
+# Header spesial diperluas ditandai field m bernilai 0 (tidak pernah valid pada header lama):
+# random (1) + '00' (2) + m-1 (3) + flags (8) + panjang pesan (32, atau 64 jika FLAG_PANJANG64)
+# [+ nonce (64) jika FLAG_KEYSTREAM] [+ tanda (16) jika FLAG_FRAME]
+# Dengan FLAG_CRC, CRC32 pesan (32 bit) ditulis sebagai trailer tepat setelah bit pesan.
+HEADER_SPESIAL_DIPERLUAS_BITS = 46
+BIT_HEADER_PAYLOAD = (HEADER_TYPE_BYTES * 8) + 1 # header tipe + flag enkripsi
+
+# Flag pada header spesial diperluas
+FLAG_ARSIP = 0x01 # payload berupa arsip banyak file dengan daftar isi (lihat stegoarchive.py)
+FLAG_PECAHAN = 0x02 # payload berupa satu pecahan dari pesan yang tersebar di banyak cover (lihat stegoshard.py)
+FLAG_KEYSTREAM = 0x04 # pesan dienkripsi dengan keystream SHAKE-256, bukan Vigenère
+FLAG_FRAME = 0x08 # payload hanya disisipkan pada byte aman frame MP3 (lihat stegoframe.py)
+FLAG_CRC = 0x10 # payload diakhiri CRC32 pesan asli (sebelum enkripsi)
+FLAG_PANJANG64 = 0x20 # field panjang pesan 64-bit, otomatis dipakai untuk pesan 512 MiB ke atas
+FLAG_ANCILLARY = 0x40 # payload ditulis langsung pada data ancillary dan bit private MP3, selalu bersama FLAG_FRAME (lihat stegoancillary.py)
+
+# Lebar field panjang pesan (dalam bit) pada header spesial
+BIT_PANJANG = 32
+BIT_PANJANG64 = 64
+
+# Dengan FLAG_FRAME, header diakhiri tanda 16-bit. Pembaca memeriksa header di byte aman frame
+# sebelum header biasa, dan tanda ini mencegah bit payload biasa terbaca sebagai header mode frame.
+TANDA_FRAME = 0x5AF3
+BIT_TANDA_FRAME = 16
+
+# Dengan FLAG_KEYSTREAM, header spesial diperluas diikuti nonce acak 64-bit agar
+# kunci yang sama tidak menghasilkan keystream yang sama untuk dua penyisipan.
+UKURAN_NONCE = 8
+LABEL_KEYSTREAM = b'stego-keystream-v1'
+# Keystream dibangkitkan per blok (mode counter) agar posisi mana pun bisa langsung dihitung
+BLOK_KEYSTREAM = 1 << 16
+
+# CRC32 dihitung pada pass penyisipan yang sama dan diletakkan setelah pesan, bukan di header
+# spesial, agar output tetap ditulis berurutan (boleh pipe) tanpa perlu kembali ke awal file.
+BIT_CRC = 32
+
+# Batas ukuran pesan dari stream (stdin/pipe) yang ditampung di memori
+# sebelum dipindahkan ke file sementara di disk.
+BATAS_SPOOL_MEMORI = 16 << 20
+
+# Jumlah byte cover yang diproses per chunk. Harus kelipatan 8 agar
+# setiap chunk menghasilkan bit pesan dalam jumlah byte yang utuh.
+UKURAN_CHUNK = 1 << 20
+
+# =============================================================
+# == FUNGSI BANTU (HELPER FUNCTIONS) ==
+# =============================================================
+
+def key_to_seed(key):
+    """Converts a string key into a numerical seed."""
+    seed = 0
+    for char in key:
+        seed = (seed * 31 + ord(char)) & 0xFFFFFFFF
+    return seed
+
+def calculate_random_start_index(message_size_in_bits, m, cover_data_length, seed,
+                                 header_spesial_size_in_bytes=HEADER_SPESIAL_BITS):
+    """
+    Calculates a random starting index based on the cover data's byte length.
+    Fungsi ini harus memberikan hasil yang sama persis saat menyisipkan dan mengekstrak.
+    """
+    print("\n--- Calculating Random Start Index for Extraction ---")
+    r = cover_data_length
+    bytes_needed_for_payload = math.ceil(message_size_in_bits / m)
+    espace = r - bytes_needed_for_payload - header_spesial_size_in_bytes
+
+    if espace <= 0:
+        return None
+
+    random.seed(seed)
+    rand_offset = random.randint(0, espace)
+    Irand = header_spesial_size_in_bytes + rand_offset
+
+    print(f"Calculated random start index: {Irand}")
+    return Irand
+
+def total_bit_payload(panjang_pesan_biner, flags=0):
+    """Jumlah bit region payload utama: header payload, pesan, dan trailer CRC jika ada."""
+    return BIT_HEADER_PAYLOAD + panjang_pesan_biner + (BIT_CRC if flags & FLAG_CRC else 0)
+
+def kapasitas_pesan(ukuran_cover, m, isRandom=False, flags=0):
+    """Menghitung ukuran pesan maksimum (byte) yang muat di cover berukuran `ukuran_cover`."""
+    ukuran_header = len(buat_header_spesial(isRandom, m, 0, flags))
+    # Titik awal acak membutuhkan minimal 1 byte ruang sisa (lihat calculate_random_start_index)
+    bytes_tersedia = ukuran_cover - ukuran_header - (1 if isRandom else 0)
+    kapasitas = (bytes_tersedia * m - total_bit_payload(0, flags)) // 8
+    if kapasitas > ((1 << BIT_PANJANG) - 1) // 8 and not flags & FLAG_PANJANG64:
+        # Pesan sebesar ini membutuhkan field panjang 64-bit, yang membuat header sedikit lebih panjang
+        return kapasitas_pesan(ukuran_cover, m, isRandom, flags | FLAG_PANJANG64)
+    return max(0, min(kapasitas, ((1 << BIT_PANJANG64) - 1) // 8))
+
+def encrypt_chunk(data_chunk, key_bytes, offset):
+    """Mengenkripsi potongan pesan dengan Vigenère, dimulai pada byte ke-`offset` pesan."""
+    kunci = np.frombuffer(key_bytes, dtype=np.uint8)
+    kunci = np.resize(np.roll(kunci, -(offset % len(kunci))), len(data_chunk))
+    return (np.frombuffer(data_chunk, dtype=np.uint8) + kunci).tobytes()
+
+def decrypt_chunk(cipher_chunk, key_bytes, offset):
+    """Mendekripsi potongan cipher Vigenère yang dimulai pada byte ke-`offset` pesan."""
+    kunci = np.frombuffer(key_bytes, dtype=np.uint8)
+    kunci = np.resize(np.roll(kunci, -(offset % len(kunci))), len(cipher_chunk))
+    return (np.frombuffer(cipher_chunk, dtype=np.uint8) - kunci).tobytes()
+
+def keystream(key_bytes, nonce, offset, n):
+    """
+    `n` byte keystream mulai dari byte ke-`offset` pesan.
+    Blok ke-i = SHAKE-256(label || nonce || panjang kunci || kunci || i), sepanjang BLOK_KEYSTREAM byte.
+    """
+    dasar = hashlib.shake_256(LABEL_KEYSTREAM + nonce + len(key_bytes).to_bytes(4, 'little') + key_bytes)
+    blok_awal = offset // BLOK_KEYSTREAM
+    blok_akhir = (offset + n + BLOK_KEYSTREAM - 1) // BLOK_KEYSTREAM
+
+    bagian = []
+    for i in range(blok_awal, blok_akhir):
+        h = dasar.copy()
+        h.update(i.to_bytes(8, 'little'))
+        bagian.append(h.digest(BLOK_KEYSTREAM))
+    awal = offset - blok_awal * BLOK_KEYSTREAM
+    return np.frombuffer(b''.join(bagian), dtype=np.uint8)[awal:awal + n]
+
+def xor_keystream(data_chunk, key_bytes, nonce, offset):
+    """Enkripsi sekaligus dekripsi (XOR dengan keystream) potongan pesan yang dimulai di byte ke-`offset`."""
+    return (np.frombuffer(data_chunk, dtype=np.uint8) ^ keystream(key_bytes, nonce, offset, len(data_chunk))).tobytes()
+
+# =============================================================
+# == EKSTRAKSI BERTAHAP (STREAMING) ==
+# =============================================================
+
+def buat_header_spesial(isRandom, m, panjang_pesan_biner, flags=0, nonce=bytes(UKURAN_NONCE)):
+    """
+    Membuat header spesial sebagai DeretBit. Header lama dipakai selama cukup
+    (m 1-3 tanpa flag) agar hasilnya tetap bisa dibaca versi sebelumnya.
+    """
+    header = DeretBit().tambah(isRandom, 1)
+    lebar_panjang = BIT_PANJANG64 if flags & FLAG_PANJANG64 else BIT_PANJANG
+    if flags == 0 and m < 4:
+        return header.tambah(m, 2).tambah(panjang_pesan_biner, lebar_panjang)
+    header.tambah(0, 2).tambah(m - 1, 3).tambah(flags, 8).tambah(panjang_pesan_biner, lebar_panjang)
+    if flags & FLAG_KEYSTREAM:
+        header.tambah_bytes(nonce)
+    if flags & FLAG_FRAME:
+        header.tambah(TANDA_FRAME, BIT_TANDA_FRAME)
+    return header
+
+def baca_header_spesial(f_stego):
+    """
+    Membaca header spesial dari byte-byte pertama file stego (selalu 1 LSB).
+    Mengembalikan (isRandom, m, panjang_pesan_biner, flags, ukuran_header, nonce).
+    """
+    f_stego.seek(0)
+    data = f_stego.read(HEADER_SPESIAL_DIPERLUAS_BITS + (BIT_PANJANG64 - BIT_PANJANG) + UKURAN_NONCE * 8
+                        + BIT_TANDA_FRAME)
+    if len(data) < HEADER_SPESIAL_BITS:
+        raise ValueError("File stego terlalu pendek untuk memuat header.")
+
+    header = DeretBit.dari_bit(baca_lsb(np.frombuffer(data, dtype=np.uint8), 1))
+    isRandom = bool(header[0])
+    m = header.ambil(1, 2)
+    if m != 0:
+        panjang_pesan_biner = header.ambil(3, BIT_PANJANG)
+        return isRandom, m, panjang_pesan_biner, 0, HEADER_SPESIAL_BITS, b''
+
+    if len(data) < HEADER_SPESIAL_DIPERLUAS_BITS:
+        raise ValueError("File stego terlalu pendek untuk memuat header.")
+    m = header.ambil(3, 3) + 1
+    flags = header.ambil(6, 8)
+    lebar_panjang = BIT_PANJANG64 if flags & FLAG_PANJANG64 else BIT_PANJANG
+
+    # Field panjang (setelah random, '00', m-1, dan flags) dan field opsional setelahnya, sesuai flag
+    posisi = HEADER_SPESIAL_DIPERLUAS_BITS - BIT_PANJANG
+    ukuran_header = posisi + lebar_panjang
+    if flags & FLAG_KEYSTREAM:
+        ukuran_header += UKURAN_NONCE * 8
+    if flags & FLAG_FRAME:
+        ukuran_header += BIT_TANDA_FRAME
+    if len(data) < ukuran_header:
+        raise ValueError("File stego terlalu pendek untuk memuat header.")
+
+    panjang_pesan_biner = header.ambil(posisi, lebar_panjang)
+    posisi += lebar_panjang
+    nonce = b''
+    if flags & FLAG_KEYSTREAM:
+        nonce = bytes(header[posisi:posisi + UKURAN_NONCE * 8])
+        posisi += UKURAN_NONCE * 8
+    if flags & FLAG_FRAME and header.ambil(posisi, BIT_TANDA_FRAME) != TANDA_FRAME:
+        raise ValueError("Tanda header mode aman-frame tidak cocok.")
+    return isRandom, m, panjang_pesan_biner, flags, ukuran_header, nonce
+
+def _baca_berurutan(f, jumlah_byte, ukuran_chunk):
+    """Membaca `jumlah_byte` byte dari posisi f saat ini per chunk, di thread pemanggil."""
+    while jumlah_byte > 0:
+        chunk = f.read(min(ukuran_chunk, jumlah_byte))
+        if not chunk:
+            return
+        yield np.frombuffer(chunk, dtype=np.uint8)
+        jumlah_byte -= len(chunk)
+
+def baca_bit_lsb(f_stego, start_byte_index, m, bit_awal, jumlah_bit, ukuran_chunk=UKURAN_CHUNK, pipa=False):
+    """
+    Membaca `jumlah_bit` bit dari m LSB tiap byte, mulai dari bit ke-`bit_awal`
+    region payload (yang dimulai di `start_byte_index`). Menghasilkan bytes per chunk.
+    Dengan `pipa`, chunk cover berikutnya sudah dibaca di thread latar selama chunk ini diproses.
+    """
+    f_stego.seek(start_byte_index + bit_awal // m)
+    lewati = bit_awal % m
+    sisa = np.zeros(0, dtype=np.uint8)
+    jumlah_byte = math.ceil((jumlah_bit + lewati) / m)
+    pembaca = PembacaLatar(f_stego, jumlah_byte, ukuran_chunk) if pipa else None
+
+    try:
+        for chunk in pembaca if pipa else _baca_berurutan(f_stego, jumlah_byte, ukuran_chunk):
+            bits = baca_lsb(chunk, m)
+            if pipa:
+                pembaca.kembalikan(chunk)
+            bits = bits[lewati:lewati + jumlah_bit]
+            lewati = 0
+            jumlah_bit -= len(bits)
+            if len(sisa):
+                bits = np.concatenate((sisa, bits))
+
+            # Sisa bit yang belum genap 1 byte dibawa ke chunk berikutnya
+            n_utuh = len(bits) - (len(bits) % 8)
+            if n_utuh:
+                yield np.packbits(bits[:n_utuh]).tobytes()
+            sisa = bits[n_utuh:]
+    finally:
+        if pipa:
+            pembaca.tutup()
+
+    if jumlah_bit > 0:
+        raise ValueError("File stego terpotong sebelum seluruh payload terbaca.")
+    if len(sisa):
+        yield np.packbits(sisa).tobytes()
+
+def baca_info_stego(f_stego, ukuran_stego, key):
+    """Membaca header spesial dan header payload (tipe file, flag enkripsi) dari file stego."""
+    isRandom, m, panjang_pesan_biner, flags, ukuran_header, nonce = baca_header_spesial(f_stego)
+
+    print(f"--- Extraction Info ---")
+    print(f"Random Start: {isRandom}, LSB Count (m): {m}, Message Bits: {panjang_pesan_biner}")
+
+    start_byte_index = ukuran_header # Default jika tidak acak
+
+    if isRandom:
+        start_byte_index = calculate_random_start_index(total_bit_payload(panjang_pesan_biner, flags), m, ukuran_stego, key_to_seed(key),
+                                                        ukuran_header)
+        if start_byte_index is None:
+            raise ValueError("Tidak dapat menghitung indeks awal. Kunci mungkin salah.")
+
+    header_payload = DeretBit(b''.join(baca_bit_lsb(f_stego, start_byte_index, m, 0, BIT_HEADER_PAYLOAD)),
+                              BIT_HEADER_PAYLOAD)
+    # Hapus padding byte null di akhir
+    tipe_file = bytes(header_payload[:HEADER_TYPE_BYTES * 8]).replace(b'\0', b'').decode('utf-8')
+    isEncrypt = bool(header_payload[HEADER_TYPE_BYTES * 8])
+
+    return {
+        'isRandom': isRandom,
+        'm': m,
+        'flags': flags,
+        'panjang_pesan_biner': panjang_pesan_biner,
+        'start_byte_index': start_byte_index,
+        'tipe_file': tipe_file,
+        'isEncrypt': isEncrypt,
+        'nonce': nonce,
+    }
+
+def rentang_payload(info):
+    """Rentang byte [awal, akhir) di file stego yang ditempati payload utama."""
+    jumlah_bit = total_bit_payload(info['panjang_pesan_biner'], info['flags'])
+    return info['start_byte_index'], info['start_byte_index'] + math.ceil(jumlah_bit / info['m'])
+
+def baca_pesan(f_stego, info, key, offset=0, panjang=None, ukuran_chunk=UKURAN_CHUNK, pipa=False):
+    """
+    Membaca `panjang` byte pesan mulai dari byte ke-`offset` pesan (langsung seek ke
+    posisi bitnya di cover), didekripsi per chunk jika perlu. Menghasilkan bytes per chunk.
+    """
+    if panjang is None:
+        panjang = info['panjang_pesan_biner'] // 8 - offset
+    key_bytes = key.encode('utf-8')
+
+    for chunk in baca_bit_lsb(f_stego, info['start_byte_index'], info['m'], BIT_HEADER_PAYLOAD + offset * 8,
+                              panjang * 8, ukuran_chunk, pipa):
+        if info['isEncrypt'] and info['flags'] & FLAG_KEYSTREAM:
+            chunk = xor_keystream(chunk, key_bytes, info['nonce'], offset)
+        elif info['isEncrypt']:
+            chunk = decrypt_chunk(chunk, key_bytes, offset)
+        yield chunk
+        offset += len(chunk)
+
+def ekstrak_stream(f_stego, info, key, f_output, ukuran_chunk=UKURAN_CHUNK, pipa=False, progres=None):
+    """
+    Mengekstrak pesan per chunk: unpack LSB, dekripsi (jika perlu), lalu langsung
+    ditulis ke `f_output`. Mengembalikan jumlah byte pesan yang ditulis.
+    Dengan `pipa`, pembacaan cover dan penulisan output berjalan di thread latar.
+    `progres` (stegoprogres.Progres, total = panjang pesan dalam byte) dimajukan per chunk.
+    """
+    if info['isEncrypt']:
+        print("Message is encrypted. Decrypting...")
+
+    jumlah = 0
+    crc = 0
+    penulis = PenulisLatar(f_output) if pipa else None
+    potongan = baca_pesan(f_stego, info, key, ukuran_chunk=ukuran_chunk, pipa=pipa)
+    try:
+        for chunk in potongan:
+            if pipa:
+                penulis.tulis(chunk)
+            else:
+                f_output.write(chunk)
+            crc = zlib.crc32(chunk, crc)
+            jumlah += len(chunk)
+            if progres is not None:
+                progres.maju(len(chunk))
+        if pipa:
+            penulis.selesai()
+    finally:
+        # Jika dibatalkan di tengah jalan, thread pembaca di baca_bit_lsb ikut dihentikan sekarang
+        potongan.close()
+        if pipa:
+            penulis.tutup()
+
+    if info['flags'] & FLAG_CRC and crc != baca_crc(f_stego, info):
+        raise ValueError("Checksum pesan tidak cocok. Kunci mungkin salah atau file stego rusak.")
+    return jumlah
+
+def baca_crc(f_stego, info):
+    """Membaca trailer CRC32 yang tersimpan setelah bit pesan (hanya untuk FLAG_CRC)."""
+    bit_awal = BIT_HEADER_PAYLOAD + info['panjang_pesan_biner']
+    data = b''.join(baca_bit_lsb(f_stego, info['start_byte_index'], info['m'], bit_awal, BIT_CRC))
+    return DeretBit(data, BIT_CRC).ambil(0, BIT_CRC)
+
+def verifikasi_stream(f_stego, info, key, ukuran_chunk=UKURAN_CHUNK, pipa=False, progres=None):
+    """
+    Memeriksa integritas payload tanpa menulis pesan ke mana pun: hanya rentang payload yang
+    dibaca, CRC32 dihitung bertahap per chunk lalu dibandingkan dengan trailer.
+    Mengembalikan (crc_tersimpan, crc_dihitung).
+    """
+    if not info['flags'] & FLAG_CRC:
+        raise ValueError("File stego tidak menyimpan checksum (disisipkan tanpa --crc).")
+
+    crc = 0
+    potongan = baca_pesan(f_stego, info, key, ukuran_chunk=ukuran_chunk, pipa=pipa)
+    try:
+        for chunk in potongan:
+            crc = zlib.crc32(chunk, crc)
+            if progres is not None:
+                progres.maju(len(chunk))
+    finally:
+        potongan.close()
+    return baca_crc(f_stego, info), crc
+
+# =============================================================
+# == PENYISIPAN BERTAHAP (STREAMING) ==
+# =============================================================
+
+def spool_stream(f_input, batas_memori=BATAS_SPOOL_MEMORI):
+    """
+    Menampung stream yang panjangnya belum diketahui (stdin/pipe) ke buffer memori
+    yang otomatis pindah ke file sementara jika melebihi `batas_memori`.
+    Mengembalikan (file, panjang) dengan posisi file di awal.
+    """
+    f_spool = tempfile.SpooledTemporaryFile(max_size=batas_memori)
+    shutil.copyfileobj(f_input, f_spool, UKURAN_CHUNK)
+    panjang = f_spool.tell()
+    f_spool.seek(0)
+    return f_spool, panjang
+
+class _SumberBit:
+    """Menyediakan bit payload sedikit demi sedikit dari iterator array bit."""
+
+    def __init__(self, potongan_bit):
+        self.potongan_bit = iter(potongan_bit)
+        self.buffer = np.zeros(0, dtype=np.uint8)
+
+    def ambil(self, n):
+        bagian = [self.buffer]
+        tersedia = len(self.buffer)
+        while tersedia < n:
+            bits = next(self.potongan_bit, None)
+            if bits is None:
+                break
+            bagian.append(bits)
+            tersedia += len(bits)
+        semua = np.concatenate(bagian)
+        self.buffer = semua[n:]
+        return semua[:n]
+
+    def tempel(self, target, m):
+        """Menyisipkan bit berikutnya ke m LSB tiap byte `target` (in-place)."""
+        sisip_lsb(target, self.ambil(len(target) * m), m)
+
+def _bit_payload(f_pesan, panjang_pesan, isEncrypt, key, tipe, ukuran_chunk, nonce=None, dengan_crc=False,
+                 mulai=0, crc=0):
+    """
+    Menghasilkan bit payload utama: header tipe, flag enkripsi, lalu pesan per chunk.
+    Jika `nonce` diberikan, pesan dienkripsi dengan keystream SHAKE-256, bukan Vigenère.
+    Jika `dengan_crc`, CRC32 pesan asli dihitung sambil jalan dan ditambahkan di akhir.
+    Dengan `mulai` > 0, header dilewati dan pesan dilanjutkan dari byte ke-`mulai` (f_pesan
+    harus sudah berada di posisi itu); `crc` adalah CRC32 pesan[:mulai].
+    """
+    if mulai == 0:
+        tipe_bytes = tipe.encode('utf-8').ljust(HEADER_TYPE_BYTES, b'\0')
+        yield DeretBit(tipe_bytes).tambah(isEncrypt, 1).ke_bit()
+
+    key_bytes = key.encode('utf-8')
+    # Satu byte pesan menjadi 8 elemen bit, jadi pesan dibaca per ukuran_chunk // 8 byte
+    # agar array bit tidak lebih besar dari satu chunk cover
+    ukuran_baca = max(1, ukuran_chunk // 8)
+    offset = mulai
+    while offset < panjang_pesan:
+        chunk = f_pesan.read(min(ukuran_baca, panjang_pesan - offset))
+        if not chunk:
+            raise ValueError("Stream pesan berakhir sebelum panjang yang diharapkan.")
+        if dengan_crc:
+            crc = zlib.crc32(chunk, crc)
+        if isEncrypt and nonce is not None:
+            chunk = xor_keystream(chunk, key_bytes, nonce, offset)
+        elif isEncrypt:
+            chunk = encrypt_chunk(chunk, key_bytes, offset)
+        yield np.unpackbits(np.frombuffer(chunk, dtype=np.uint8))
+        offset += len(chunk)
+
+    if dengan_crc:
+        yield DeretBit().tambah(crc, BIT_CRC).ke_bit()
+
+def _header_sisip(panjang_pesan, isRandom, m, flags, nonce=None):
+    """
+    Bagian rencana penyisipan yang tidak bergantung pada cover: flag akhir, nonce, dan bit header spesial.
+    `nonce` hanya diberikan saat melanjutkan penyisipan yang sudah punya nonce.
+    """
+    panjang_pesan_biner = panjang_pesan * 8
+    if panjang_pesan_biner >= 1 << BIT_PANJANG64:
+        raise ValueError("Pesan terlalu besar untuk header panjang 64-bit.")
+    if panjang_pesan_biner >= 1 << BIT_PANJANG:
+        flags |= FLAG_PANJANG64
+
+    # Nonce baru untuk setiap penyisipan (termasuk pembaruan) agar keystream tidak pernah dipakai ulang
+    if not flags & FLAG_KEYSTREAM:
+        nonce = None
+    elif nonce is None:
+        nonce = os.urandom(UKURAN_NONCE)
+    bit_spesial = buat_header_spesial(isRandom, m, panjang_pesan_biner, flags, nonce).ke_bit()
+
+    return {
+        'm': m,
+        'isRandom': isRandom,
+        'flags': flags,
+        'bit_spesial': bit_spesial,
+        'nonce': nonce,
+        'jumlah_bit_payload': total_bit_payload(panjang_pesan_biner, flags),
+    }
+
+def _tata_letak_sisip(header, ukuran_cover, key):
+    """Melengkapi hasil _header_sisip dengan byte awal dan akhir payload untuk cover berukuran `ukuran_cover`."""
+    m = header['m']
+    jumlah_bit_payload = header['jumlah_bit_payload']
+    bytes_needed_for_special = len(header['bit_spesial'])
+    bytes_needed_for_main = math.ceil(jumlah_bit_payload / m)
+
+    if (bytes_needed_for_special + bytes_needed_for_main) > ukuran_cover:
+        raise ValueError("Kapasitas file cover tidak mencukupi.")
+
+    start_byte_index = bytes_needed_for_special
+    if header['isRandom']:
+        start_byte_index = calculate_random_start_index(jumlah_bit_payload, m, ukuran_cover, key_to_seed(key),
+                                                        bytes_needed_for_special)
+        if start_byte_index is None:
+            raise ValueError("Kapasitas file cover tidak mencukupi untuk titik awal acak.")
+
+    return dict(header, start_byte_index=start_byte_index, end_byte_index=start_byte_index + bytes_needed_for_main)
+
+def _rencana_sisip(ukuran_cover, panjang_pesan, isRandom, m, key, flags):
+    """Menghitung tata letak penyisipan: bit header spesial serta byte awal dan akhir payload."""
+    return _tata_letak_sisip(_header_sisip(panjang_pesan, isRandom, m, flags), ukuran_cover, key)
+
+def _patch_chunk(chunk, posisi, rencana, sumber):
+    """Menulis header spesial dan payload ke chunk cover yang dimulai di byte `posisi` (in-place)."""
+    akhir = posisi + len(chunk)
+    bit_spesial = rencana['bit_spesial']
+
+    # Header spesial selalu di 1 LSB byte-byte pertama
+    if posisi < len(bit_spesial):
+        a, b = posisi, min(akhir, len(bit_spesial))
+        sisip_lsb(chunk[a - posisi:b - posisi], bit_spesial[a:b], 1)
+
+    # Payload utama di m LSB mulai dari start_byte_index
+    a, b = max(posisi, rencana['start_byte_index']), min(akhir, rencana['end_byte_index'])
+    if a < b:
+        sumber.tempel(chunk[a - posisi:b - posisi], rencana['m'])
+
+def sisipkan_stream(f_cover, ukuran_cover, f_pesan, panjang_pesan, f_output,
+                    isEncrypt, isRandom, m, key, tipe, flags=0, ukuran_chunk=UKURAN_CHUNK, pipa=False, progres=None):
+    """
+    Menyisipkan pesan dari `f_pesan` (panjang diketahui) ke cover per chunk dan menulis
+    hasilnya secara berurutan ke `f_output`, sehingga output boleh berupa pipe.
+    Dengan `pipa`, cover dibaca dan output ditulis di thread latar (lihat stegopipa.py).
+    `progres` (stegoprogres.Progres, total = ukuran cover) dimajukan setiap chunk tertulis.
+    """
+    if not isEncrypt:
+        flags &= ~FLAG_KEYSTREAM
+    rencana = _rencana_sisip(ukuran_cover, panjang_pesan, isRandom, m, key, flags)
+    sumber = _SumberBit(_bit_payload(f_pesan, panjang_pesan, isEncrypt, key, tipe, ukuran_chunk, rencana['nonce'],
+                                     bool(flags & FLAG_CRC)))
+    _tulis_tersisip(f_cover, ukuran_cover, f_output, rencana, sumber, ukuran_chunk, pipa,
+                    setelah_chunk=progres.ke if progres is not None else None)
+    return rencana['start_byte_index']
+
+def _tulis_tersisip(f_cover, ukuran_cover, f_output, rencana, sumber, ukuran_chunk, pipa,
+                    posisi_awal=0, setelah_chunk=None):
+    """
+    Membaca cover per chunk, menempelkan header dan payload dari `sumber`, lalu menulis hasilnya.
+    f_cover dan f_output sudah berada di byte `posisi_awal`. `setelah_chunk(n)` dipanggil setiap
+    kali byte output [0, n) sudah diserahkan ke f_output.
+    """
+    if pipa:
+        _sisipkan_pipa(f_cover, ukuran_cover, f_output, rencana, sumber, ukuran_chunk, posisi_awal, setelah_chunk)
+        return
+
+    posisi = posisi_awal
+    while posisi < ukuran_cover:
+        data = f_cover.read(min(ukuran_chunk, ukuran_cover - posisi))
+        if not data:
+            raise ValueError("File cover terpotong.")
+        chunk = np.frombuffer(data, dtype=np.uint8).copy()
+        _patch_chunk(chunk, posisi, rencana, sumber)
+        f_output.write(chunk.tobytes())
+        posisi += len(chunk)
+        if setelah_chunk is not None:
+            setelah_chunk(posisi)
+
+def _sisipkan_pipa(f_cover, ukuran_cover, f_output, rencana, sumber, ukuran_chunk, posisi_awal=0, setelah_chunk=None):
+    """Seperti loop di _tulis_tersisip, tetapi baca dan tulis tumpang-tindih dengan patch chunk."""
+    pembaca = PembacaLatar(f_cover, ukuran_cover - posisi_awal, ukuran_chunk)
+    penulis = PenulisLatar(f_output)
+    posisi = posisi_awal
+    try:
+        for chunk in pembaca:
+            # Buffer pembaca di-patch di tempat dan baru dipakai ulang setelah selesai ditulis
+            _patch_chunk(chunk, posisi, rencana, sumber)
+            penulis.tulis(chunk, pembaca.kembalikan)
+            posisi += len(chunk)
+            if setelah_chunk is not None:
+                # Hanya byte yang sudah benar-benar ditulis thread penulis yang boleh dianggap selesai
+                setelah_chunk(posisi_awal + penulis.tertulis)
+        penulis.selesai()
+        if setelah_chunk is not None:
+            setelah_chunk(posisi_awal + penulis.tertulis)
+    finally:
+        penulis.tutup()
+        pembaca.tutup()
+
+    if posisi < ukuran_cover:
+        raise ValueError("File cover terpotong.")
+
+def bit_tertanam(rencana, posisi):
+    """Jumlah bit payload yang sudah tertanam di byte cover [0, posisi)."""
+    return min(max(posisi - rencana['start_byte_index'], 0) * rencana['m'], rencana['jumlah_bit_payload'])
+
+def byte_pesan_tertanam(rencana, posisi, panjang_pesan):
+    """Jumlah byte pesan yang sudah tertanam utuh di byte cover [0, posisi)."""
+    return min(max(bit_tertanam(rencana, posisi) - BIT_HEADER_PAYLOAD, 0) // 8, panjang_pesan)
+
+def lanjutkan_stream(f_cover, ukuran_cover, f_pesan, panjang_pesan, f_output, rencana, posisi, crc,
+                     isEncrypt, key, tipe, ukuran_chunk=UKURAN_CHUNK, pipa=False, setelah_chunk=None):
+    """
+    Melanjutkan sisipkan_stream yang terputus: byte output [0, posisi) sudah benar, f_cover dan
+    f_output berada di `posisi`, dan f_pesan di byte_pesan_tertanam(rencana, posisi, panjang_pesan).
+    `rencana` harus identik dengan rencana penyisipan semula (termasuk nonce); `crc` adalah CRC32
+    pesan sampai posisi f_pesan. Hasil akhirnya sama byte demi byte dengan penyisipan tanpa putus.
+    """
+    mulai = byte_pesan_tertanam(rencana, posisi, panjang_pesan)
+    bit_lewati = bit_tertanam(rencana, posisi)
+    if mulai > 0:
+        bit_lewati -= BIT_HEADER_PAYLOAD + mulai * 8
+    sumber = _SumberBit(_bit_payload(f_pesan, panjang_pesan, isEncrypt, key, tipe, ukuran_chunk, rencana['nonce'],
+                                     bool(rencana['flags'] & FLAG_CRC), mulai, crc))
+    sumber.ambil(bit_lewati)
+    _tulis_tersisip(f_cover, ukuran_cover, f_output, rencana, sumber, ukuran_chunk, pipa, posisi, setelah_chunk)
+
+# =============================================================
+# == PAYLOAD SIAP PAKAI (SATU PESAN KE BANYAK COVER) ==
+# =============================================================
+#
+# Enkripsi, header spesial, dan penyusunan bit payload menjadi nilai m-bit per byte cover
+# tidak bergantung pada cover; hanya titik awal (acak) yang dihitung ulang per cover.
+# PayloadSiap menyimpan hasil itu sekali, sehingga setiap cover tambahan hanya membutuhkan
+# penempelan (mask + OR per byte) dan penulisan. Dengan FLAG_KEYSTREAM, semua cover dari
+# satu PayloadSiap memakai nonce yang sama; karena pesannya pun sama, yang terungkap
+# hanyalah bahwa cover-cover itu membawa pesan yang sama.
+#
+# Satu PayloadSiap berukuran sekitar 8/m kali pesan. CachePayload tidak dipakai secara
+# global: pemanggil yang mengulang pesan yang sama di banyak panggilan membuatnya sendiri.
+
+BATAS_ENTRI_CACHE_PAYLOAD = 8
+BATAS_BYTE_CACHE_PAYLOAD = 256 << 20
+
+class PayloadSiap:
+    """Payload yang sudah dienkripsi dan disusun menjadi nilai m LSB untuk setiap byte cover."""
+
+    def __init__(self, header, kelompok, sisa_bit):
+        self.header = header # hasil _header_sisip
+        self.kelompok = kelompok # nilai m LSB untuk setiap byte cover yang terisi penuh
+        self.sisa_bit = sisa_bit # bit kelompok terakhir yang hanya terisi sebagian (< m bit)
+
+    @property
+    def ukuran(self):
+        return self.kelompok.nbytes + self.sisa_bit.nbytes + self.header['bit_spesial'].nbytes
+
+class _SumberKelompok:
+    """Pengganti _SumberBit untuk PayloadSiap: menempelkan nilai m-bit yang sudah disusun."""
+
+    def __init__(self, payload):
+        self.kelompok = payload.kelompok
+        self.sisa_bit = payload.sisa_bit
+        self.posisi = 0
+
+    def tempel(self, target, m):
+        n = min(len(target), len(self.kelompok) - self.posisi)
+        if n > 0:
+            mask = np.uint8(0xFF & ~((1 << m) - 1))
+            target[:n] = (target[:n] & mask) | self.kelompok[self.posisi:self.posisi + n]
+            self.posisi += n
+        if n < len(target) and len(self.sisa_bit):
+            sisip_lsb(target[n:n + 1], self.sisa_bit, m)
+            self.sisa_bit = self.sisa_bit[:0]
+
+def siapkan_payload(f_pesan, panjang_pesan, isEncrypt, isRandom, m, key, tipe, flags=0, ukuran_chunk=UKURAN_CHUNK):
+    """Membaca dan mengenkripsi pesan sekali, lalu menyusunnya menjadi PayloadSiap."""
+    if not isEncrypt:
+        flags &= ~FLAG_KEYSTREAM
+    header = _header_sisip(panjang_pesan, isRandom, m, flags)
+    sumber = _SumberBit(_bit_payload(f_pesan, panjang_pesan, isEncrypt, key, tipe, ukuran_chunk, header['nonce'],
+                                     bool(header['flags'] & FLAG_CRC)))
+
+    # Nilai tiap kelompok disusun dengan kernel yang sama seperti penyisipan biasa (ke array nol),
+    # sehingga urutan bitnya dijamin identik
+    n_penuh = header['jumlah_bit_payload'] // m
+    kelompok = np.zeros(n_penuh, dtype=np.uint8)
+    for awal in range(0, n_penuh, ukuran_chunk):
+        target = kelompok[awal:awal + ukuran_chunk]
+        sisip_lsb(target, sumber.ambil(len(target) * m), m)
+    sisa_bit = sumber.ambil(header['jumlah_bit_payload'] - n_penuh * m)
+    return PayloadSiap(header, kelompok, sisa_bit)
+
+def sisipkan_siap(f_cover, ukuran_cover, payload, f_output, key, ukuran_chunk=UKURAN_CHUNK, pipa=False,
+                  progres=None):
+    """
+    Seperti sisipkan_stream, tetapi pesannya berupa PayloadSiap. `key` harus sama dengan kunci
+    saat payload disiapkan (dipakai untuk titik awal acak). Mengembalikan byte awal payload.
+    """
+    rencana = _tata_letak_sisip(payload.header, ukuran_cover, key)
+    _tulis_tersisip(f_cover, ukuran_cover, f_output, rencana, _SumberKelompok(payload), ukuran_chunk, pipa,
+                    setelah_chunk=progres.ke if progres is not None else None)
+    return rencana['start_byte_index']
+
+def _hash_pesan(f):
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: f.read(UKURAN_CHUNK), b''):
+        h.update(chunk)
+    return h.digest()
+
+class CachePayload:
+    """
+    Cache LRU berisi PayloadSiap dengan kunci (hash pesan, kunci, mode enkripsi, m, tipe, flags).
+    Entri terlama dibuang jika jumlah entri atau total ukuran payload melewati batas.
+    """
+
+    def __init__(self, batas_entri=BATAS_ENTRI_CACHE_PAYLOAD, batas_byte=BATAS_BYTE_CACHE_PAYLOAD):
+        self.batas_entri = batas_entri
+        self.batas_byte = batas_byte
+        self._entri = OrderedDict()
+        self.ukuran = 0
+        self.hit = 0
+        self.miss = 0
+
+    def ambil(self, pesan, isEncrypt, isRandom, m, key, tipe, flags=0):
+        """PayloadSiap untuk `pesan` (bytes atau path file), disiapkan hanya jika belum ada di cache."""
+        if isinstance(pesan, (bytes, bytearray)):
+            buka = lambda: io.BytesIO(pesan)
+            panjang_pesan = len(pesan)
+        else:
+            buka = lambda: open(pesan, "rb")
+            panjang_pesan = os.path.getsize(pesan)
+
+        with buka() as f_pesan:
+            kunci = (_hash_pesan(f_pesan), key, isEncrypt, isRandom, m, tipe, flags)
+            payload = self._entri.get(kunci)
+            if payload is not None:
+                self.hit += 1
+                self._entri.move_to_end(kunci)
+                return payload
+
+            self.miss += 1
+            f_pesan.seek(0)
+            payload = siapkan_payload(f_pesan, panjang_pesan, isEncrypt, isRandom, m, key, tipe, flags)
+
+        # Payload yang sendirian sudah melebihi batas tidak disimpan
+        if payload.ukuran <= self.batas_byte:
+            self._entri[kunci] = payload
+            self.ukuran += payload.ukuran
+            while len(self._entri) > self.batas_entri or self.ukuran > self.batas_byte:
+                _, dibuang = self._entri.popitem(last=False)
+                self.ukuran -= dibuang.ukuran
+        return payload
+
+    def kosongkan(self):
+        self._entri.clear()
+        self.ukuran = 0
+
+# =============================================================
+# == PEMBARUAN INKREMENTAL ==
+# =============================================================
+
+# Byte tak berubah di antara dua byte berubah yang berjarak kurang dari ini ikut
+# ditulis ulang, agar tidak terjadi terlalu banyak seek + write kecil.
+CELAH_GABUNG_PATCH = 64
+
+def perbarui_stream(f_stego, ukuran_stego, f_pesan, panjang_pesan, key, isEncrypt, tipe, flags=0,
+                    ukuran_chunk=UKURAN_CHUNK):
+    """
+    Mengganti pesan di file stego (dibuka 'r+b') dengan pesan baru memakai m dan mode titik awal
+    yang sama. Hanya byte yang bit-bit rendahnya benar-benar berubah yang ditulis ulang, sehingga
+    pembaruan kecil hanya menulis sebanyak bit yang berubah. Mengembalikan jumlah byte yang ditulis.
+    """
+    isRandom, m, _, flags_lama, _, _ = baca_header_spesial(f_stego)
+    # Pesan yang sebelumnya disisipkan dengan checksum tetap diberi checksum
+    flags |= flags_lama & FLAG_CRC
+    if not isEncrypt:
+        flags &= ~FLAG_KEYSTREAM
+    rencana = _rencana_sisip(ukuran_stego, panjang_pesan, isRandom, m, key, flags)
+    sumber = _SumberBit(_bit_payload(f_pesan, panjang_pesan, isEncrypt, key, tipe, ukuran_chunk, rencana['nonce'],
+                                     bool(flags & FLAG_CRC)))
+
+    # Hanya header spesial dan region payload baru yang perlu diperiksa
+    daerah = [(0, len(rencana['bit_spesial'])), (rencana['start_byte_index'], rencana['end_byte_index'])]
+    if daerah[1][0] <= daerah[0][1]:
+        daerah = [(0, daerah[1][1])]
+
+    jumlah_ditulis = 0
+    for awal, akhir in daerah:
+        for posisi in range(awal, akhir, ukuran_chunk):
+            f_stego.seek(posisi)
+            lama = np.frombuffer(f_stego.read(min(ukuran_chunk, akhir - posisi)), dtype=np.uint8)
+            baru = lama.copy()
+            _patch_chunk(baru, posisi, rencana, sumber)
+
+            berubah = np.flatnonzero(baru != lama)
+            if len(berubah) == 0:
+                continue
+            # Kelompokkan byte berubah menjadi rentang-rentang yang ditulis sekaligus
+            putus = np.flatnonzero(np.diff(berubah) > CELAH_GABUNG_PATCH) + 1
+            for rentang in np.split(berubah, putus):
+                a, b = int(rentang[0]), int(rentang[-1]) + 1
+                f_stego.seek(posisi + a)
+                f_stego.write(baru[a:b].tobytes())
+                jumlah_ditulis += b - a
+
+    return jumlah_ditulis
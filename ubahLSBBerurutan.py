@@ -1,3 +1,6 @@
+import numpy as np
+from stegokernel import sisip_lsb
+
 # Ini buat baca file
 namaFile = "makan.mp3"
 
@@ -13,13 +16,6 @@ for i in range(0, 9):
     if(i%8 == 0 and  i != 0):
         print("\n")
 
-# ubah data audio menjadi list supaya bisa diubah per-index
-listedData = [""] * len(data)
-for i in range(0, len(data)):
-    temp = format(data[i], '08b')
-    listedData[i] = list(temp)
-
-
 # ----------------------------------------------------------------
 print("### di bawah ini adalah setelah manipulasi ###")
 iByte = 1
@@ -36,27 +32,14 @@ if(byteYangDiperlukan > len(data)):                 # message terlalu panjang un
     exit()
 else:
     idxByteYgInginDiUbah = [i for i in range(0, byteYangDiperlukan)]
-    idxMessage = 0      # index untuk memasukkan message
-    for i in idxByteYgInginDiUbah:
-        for j in range(8-nLSB, 8):
-            if(idxMessage < len(message)):
-                listedData[i][j] = message[idxMessage]
-                idxMessage = idxMessage+1              
-                
-    # ------------------------------------------------------------------
-        
-
-    # 01001001 = string --> idx 0 ada di paling kiri
 
-    # bikin file audio yang baru
-    # gabungkan kembali list of char ke integer
-    reconstructed = []
-    for i in range(len(listedData)):
-        bitstring = "".join(listedData[i])   # misal: ['0','1','0','0','1','0','0','1'] -> "01001001"
-        reconstructed.append(int(bitstring, 2))  # string -> integer
+    # sisipkan message ke nLSB tiap byte lewat kernel LSB (bit pertama di posisi tertinggi)
+    bitMessage = np.frombuffer(message.encode('ascii'), dtype=np.uint8) - ord('0')
+    audioBaru = np.frombuffer(data, dtype=np.uint8).copy()
+    sisip_lsb(audioBaru[:byteYangDiperlukan], bitMessage, nLSB)
 
-    # ubah list of integer ke bytes
-    newAudio = bytes(reconstructed)
+    # ubah array kembali ke bytes
+    newAudio = audioBaru.tobytes()
     
     
     # bandingkan before-after